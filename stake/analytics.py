@@ -0,0 +1,171 @@
+"""Vectorized analytics over the user's equity positions.
+
+Requires numpy: pip install numpy
+"""
+
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Tuple, Union
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore
+
+from stake import equity
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+__all__ = ["Portfolio"]
+
+Shocks = Union[float, Mapping[str, float], "np.ndarray"]
+
+# the columns aggregated by Portfolio.aggregate.
+AGGREGATED = ("market_value", "cost_basis", "unrealized_pl", "daily_return_value")
+
+
+class Portfolio:
+    """The NYSE positions loaded into numpy arrays, one item per position.
+
+    Examples:
+        equities = await client.equities.list()
+        portfolio = Portfolio(equities)
+        portfolio.weights()
+        portfolio.aggregate()
+        portfolio.shocked_pnl({"ETF": -0.1, "Stock": -0.2})
+    """
+
+    def __init__(self, equities: Union[equity.EquityPositions, "np.ndarray"]):
+        """
+        Args:
+            equities (Union[equity.EquityPositions, np.ndarray]): the
+                positions, as returned by EquitiesClient.list, or their
+                columns, as returned by EquitiesClient.list_columns.
+
+        Raises:
+            ImportError: if numpy is not installed.
+        """
+        if numpy is None:
+            raise ImportError(
+                "The portfolio analytics require numpy: pip install numpy"
+            )
+
+        array = (
+            equities.to_numpy()
+            if isinstance(equities, equity.EquityPositions)
+            else equities
+        )
+        self.symbols: "np.ndarray" = array["symbol"]
+        self.categories: "np.ndarray" = array["category"]
+        # missing amounts do not count towards the totals.
+        self.open_qty = numpy.nan_to_num(array["open_qty"])
+        self.market_value = numpy.nan_to_num(array["market_value"])
+        self.cost_basis = numpy.nan_to_num(array["cost_basis"])
+        self.unrealized_pl = numpy.nan_to_num(array["unrealized_pl"])
+        self.daily_return_value = numpy.nan_to_num(array["daily_return_value"])
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def total_value(self) -> float:
+        return float(self.market_value.sum())
+
+    def weights(self) -> "np.ndarray":
+        """The share of the portfolio's market value held in each position."""
+        total = self.total_value
+        if not total:
+            return numpy.zeros(len(self))
+        return self.market_value / total
+
+    def contributions(self) -> "np.ndarray":
+        """The contribution of each position to the portfolio's daily return,
+        relative to the portfolio's value at the previous close."""
+        previous = self.total_value - float(self.daily_return_value.sum())
+        if not previous:
+            return numpy.zeros(len(self))
+        return self.daily_return_value / previous
+
+    def _groups(self, by: str) -> Tuple[List[Optional[str]], "np.ndarray"]:
+        """Returns the group keys and the group index of each position."""
+        if by == "category":
+            labels = self.categories
+        elif by == "symbol":
+            labels = self.symbols
+        else:
+            raise ValueError(f"Cannot group the positions by '{by}'.")
+        # positions without a category are grouped under None.
+        keys, index = numpy.unique(
+            numpy.array(["" if label is None else label for label in labels]),
+            return_inverse=True,
+        )
+        return [key or None for key in keys.tolist()], index.reshape(-1)
+
+    def aggregate(self, by: str = "category") -> Dict[Optional[str], Dict[str, float]]:
+        """Sums the market value, cost basis, unrealized and daily P&L of the
+        positions of each group, and computes the group's weight.
+
+        Args:
+            by (str): either "category" (see equity.EquityCategory) or
+                "symbol".
+
+        Returns:
+            Dict[Optional[str], Dict[str, float]]: the totals of each group.
+        """
+        keys, index = self._groups(by)
+        sums = {
+            name: numpy.bincount(
+                index, weights=getattr(self, name), minlength=len(keys)
+            )
+            for name in AGGREGATED
+        }
+        total = self.total_value
+        weights = sums["market_value"] / total if total else numpy.zeros(len(keys))
+        return {
+            key: {
+                **{name: float(values[i]) for name, values in sums.items()},
+                "weight": float(weights[i]),
+            }
+            for i, key in enumerate(keys)
+        }
+
+    def shocks(self, shocks: Shocks, by: str = "category") -> "np.ndarray":
+        """Expands the shocks to one relative change per position.
+
+        Args:
+            shocks (Shocks): a relative change applied to every position
+                (e.g. -0.1 for a 10% drop), a mapping of the groups to their
+                change (the others are left unchanged), or an array of
+                changes with one column per position and optionally one row
+                per scenario.
+            by (str): what the keys of a mapping are, "category" or "symbol".
+
+        Returns:
+            np.ndarray: the relative changes, shaped (positions,) or
+                (scenarios, positions).
+        """
+        if isinstance(shocks, Mapping):
+            keys, index = self._groups(by)
+            # the positions without a category are never shocked by a mapping.
+            changes = [0.0 if key is None else shocks.get(key, 0.0) for key in keys]
+            return numpy.array(changes)[index]
+        shocks = numpy.asarray(shocks, dtype=numpy.float64)
+        if shocks.ndim == 0:
+            return numpy.full(len(self), float(shocks))
+        if shocks.shape[-1] != len(self):
+            raise ValueError(
+                f"Expected {len(self)} shocks per scenario, got {shocks.shape[-1]}."
+            )
+        return shocks
+
+    def shocked_values(self, shocks: Shocks, by: str = "category") -> "np.ndarray":
+        """The market value of each position after the shocks, shaped like
+        Portfolio.shocks."""
+        return self.market_value * (1 + self.shocks(shocks, by=by))
+
+    def shocked_pnl(
+        self, shocks: Shocks, by: str = "category"
+    ) -> Union[float, "np.ndarray"]:
+        """The change in the portfolio's market value caused by the shocks, a
+        float or an array with one value per scenario."""
+        pnl = self.shocks(shocks, by=by) @ self.market_value
+        return float(pnl) if numpy.ndim(pnl) == 0 else pnl
@@ -1,9 +1,25 @@
-from . import equity, funding, market, order, product, trade, transaction  # noqa
+from . import (  # noqa
+    bars,
+    depth,
+    equity,
+    funding,
+    market,
+    order,
+    product,
+    tape,
+    ticks,
+    trade,
+    transaction,
+)
+from .bars import *  # noqa: F401, F403
 from .common import *  # noqa: F401, F403
+from .depth import *  # noqa: F401, F403
 from .equity import *  # noqa: F401, F403
 from .funding import *  # noqa: F401, F403
 from .market import *  # noqa: F401, F403
 from .order import *  # noqa: F401, F403
 from .product import *  # noqa: F401, F403
+from .tape import *  # noqa: F401, F403
+from .ticks import *  # noqa: F401, F403
 from .trade import *  # noqa: F401, F403
 from .transaction import *  # noqa: F401, F403
@@ -0,0 +1,235 @@
+"""OHLCV and VWAP bars built from the ASX course of sales.
+
+Requires numpy: pip install numpy
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore
+
+from stake.asx.product import CourseOfSale
+
+if TYPE_CHECKING:  # pragma: no cover
+    from stake.asx.ticks import Ticks
+
+__all__ = ["Bar", "BarBuilder"]
+
+
+class Bar(NamedTuple):
+    """The trades of an interval, starting at `start` (epoch milliseconds).
+
+    A bar left without trades, because they were all cancelled, has no
+    prices (nan) and a volume of 0.
+    """
+
+    start: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+    value: float
+    vwap: float
+    trades: int
+
+
+class _Print(NamedTuple):
+    """The fields of a course of sales print used by the bars."""
+
+    time: int
+    price: float
+    volume: int
+    cancelled: bool
+
+
+class BarBuilder:
+    """Aggregates the ticks of a symbol into bars of `interval` milliseconds.
+
+    The ticks are kept in compact columns sorted by time. Every update only
+    rebuilds the bars from the oldest interval it touches, in a handful of
+    numpy operations, and returns the bars which changed.
+
+    Examples:
+        builder = BarBuilder(interval=60_000)
+        sales = await client.products.course_of_sales("ORG")
+        builder.update(sales.course_of_sales)
+        builder.bars()
+    """
+
+    def __init__(self, interval: int = 60_000):
+        """
+        Args:
+            interval (int): the length of a bar, in milliseconds.
+
+        Raises:
+            ImportError: if numpy is not installed.
+        """
+        if numpy is None:
+            raise ImportError("The bar builder requires numpy: pip install numpy")
+        if interval < 1:
+            raise ValueError("'interval' must be at least 1 millisecond.")
+        self.interval = interval
+        self._time = array("q")
+        self._price = array("d")
+        self._volume = array("q")
+        self._cancelled = array("b")
+        # the position of the prints in the columns, by id.
+        self._index: Dict[str, int] = {}
+        self._bars: Dict[int, Bar] = {}
+
+    def __len__(self) -> int:
+        return len(self._bars)
+
+    def bars(self, start: Optional[int] = None, end: Optional[int] = None) -> List[Bar]:
+        """The bars starting from `start` (included) to `end` (excluded),
+        oldest first."""
+        return [
+            bar
+            for key, bar in sorted(self._bars.items())
+            if (start is None or bar.start >= start)
+            and (end is None or bar.start < end)
+        ]
+
+    def update(self, sales: Iterable[CourseOfSale]) -> List[Bar]:
+        """Adds the new prints, and removes the cancelled ones from their bar.
+
+        The prints can be passed in any order, and more than once: a print
+        already added is only looked at for its cancellation. Prints without
+        a trade time, a price or a volume are skipped.
+
+        Returns:
+            List[Bar]: the bars which changed.
+        """
+        rebuild_from: Optional[int] = None
+        new: Dict[str, _Print] = {}
+        for sale in sales:
+            time, price, volume = sale.trade_time_millis, sale.price, sale.volume
+            if time is None or price is None or volume is None:
+                continue
+            cancelled = sale.cancelled_time_millis is not None
+            index = self._index.get(sale.id) if sale.id is not None else None
+            if index is None:
+                id_ = sale.id or str(len(self._index) + len(new))
+                new[id_] = _Print(time, price, volume, cancelled)
+            elif cancelled and not self._cancelled[index]:
+                self._cancelled[index] = 1
+                rebuild_from = _earliest(rebuild_from, self._time[index])
+
+        if new:
+            prints = sorted(new.items(), key=lambda item: item[1].time)
+            rebuild_from = _earliest(rebuild_from, prints[0][1].time)
+            self._extend(
+                [print_.time for _, print_ in prints],
+                [print_.price for _, print_ in prints],
+                [print_.volume for _, print_ in prints],
+                [print_.cancelled for _, print_ in prints],
+                [id_ for id_, _ in prints],
+            )
+        return self._rebuild(rebuild_from)
+
+    def add_ticks(self, ticks: "Ticks") -> List[Bar]:
+        """Adds ticks from a columnar buffer, such as TickStore.ticks.
+
+        Returns:
+            List[Bar]: the bars which changed.
+        """
+        if not len(ticks.time):
+            return []
+        time = numpy.asarray(ticks.time, dtype=numpy.int64)
+        order = numpy.argsort(time, kind="stable")
+        self._extend(
+            time[order].tolist(),
+            numpy.asarray(ticks.price, dtype=numpy.float64)[order].tolist(),
+            numpy.asarray(ticks.volume, dtype=numpy.int64)[order].tolist(),
+            [False] * len(order),
+            None,
+        )
+        return self._rebuild(int(time[order[0]]))
+
+    def _extend(
+        self,
+        time: Sequence[int],
+        price: Sequence[float],
+        volume: Sequence[int],
+        cancelled: Sequence[bool],
+        ids: Optional[Sequence[str]],
+    ) -> None:
+        """Appends ticks sorted by time, keeping the columns sorted."""
+        start = len(self._time)
+        in_order = not start or time[0] >= self._time[-1]
+        self._time.extend(time)
+        self._price.extend(price)
+        self._volume.extend(volume)
+        self._cancelled.extend(cancelled)
+        if ids is not None:
+            self._index.update(zip(ids, range(start, start + len(ids))))
+        if in_order:
+            return
+
+        # a late tick: sort the columns again, and move the ids along.
+        order = numpy.argsort(numpy.frombuffer(self._time, numpy.int64), kind="stable")
+        for name, dtype in (
+            ("_time", numpy.int64),
+            ("_price", numpy.float64),
+            ("_volume", numpy.int64),
+            ("_cancelled", numpy.int8),
+        ):
+            column = getattr(self, name)
+            sorted_ = numpy.frombuffer(column, dtype)[order].tobytes()
+            setattr(self, name, array(column.typecode, sorted_))
+        positions = numpy.empty_like(order)
+        positions[order] = numpy.arange(len(order))
+        self._index = {id_: int(positions[index]) for id_, index in self._index.items()}
+
+    def _rebuild(self, from_time: Optional[int]) -> List[Bar]:
+        """Rebuilds the bars from the one containing `from_time`."""
+        if from_time is None:
+            return []
+        first = from_time // self.interval * self.interval
+        lo = bisect_left(self._time, first)
+
+        time = numpy.frombuffer(self._time, numpy.int64)[lo:]
+        keep = numpy.frombuffer(self._cancelled, numpy.int8)[lo:] == 0
+        time = time[keep]
+        price = numpy.frombuffer(self._price, numpy.float64)[lo:][keep]
+        volume = numpy.frombuffer(self._volume, numpy.int64)[lo:][keep]
+
+        bars: Dict[int, Bar] = {}
+        if len(time):
+            keys = time // self.interval * self.interval
+            starts = numpy.flatnonzero(numpy.r_[True, keys[1:] != keys[:-1]])
+            ends = numpy.r_[starts[1:], len(time)]
+            traded = numpy.add.reduceat(volume, starts)
+            value = numpy.add.reduceat(price * volume, starts)
+            with numpy.errstate(invalid="ignore", divide="ignore"):
+                vwap = value / traded
+            for row in zip(
+                keys[starts].tolist(),
+                price[starts].tolist(),
+                numpy.maximum.reduceat(price, starts).tolist(),
+                numpy.minimum.reduceat(price, starts).tolist(),
+                price[ends - 1].tolist(),
+                traded.tolist(),
+                value.tolist(),
+                vwap.tolist(),
+                (ends - starts).tolist(),
+            ):
+                bars[row[0]] = Bar(*row)
+
+        changed = [bar for key, bar in bars.items() if self._bars.get(key) != bar]
+        nan = float("nan")
+        for key in [key for key in self._bars if key >= first and key not in bars]:
+            # every trade of the bar was cancelled.
+            del self._bars[key]
+            changed.append(Bar(key, nan, nan, nan, nan, 0, 0.0, nan, 0))
+        self._bars.update(bars)
+        return sorted(changed, key=lambda bar: bar.start)
+
+
+def _earliest(current: Optional[int], time: int) -> int:
+    return time if current is None else min(current, time)
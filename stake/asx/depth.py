@@ -0,0 +1,201 @@
+import asyncio
+from array import array
+from bisect import bisect_left, bisect_right
+from enum import Enum
+from itertools import accumulate
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from stake.common import BaseClient
+
+if TYPE_CHECKING:  # pragma: no cover
+    from stake.client import StakeClient
+
+__all__ = ["BookSide", "DepthChange", "OrderBook", "DepthTracker"]
+
+
+class BookSide(str, Enum):
+    BUY = "buy"
+    SELL = "sell"
+
+
+class DepthChange(NamedTuple):
+    """A price level which changed between two depth snapshots, a volume of 0
+    means the level is gone."""
+
+    side: BookSide
+    price: float
+    volume: int
+    number_of_orders: int
+
+
+class _Levels:
+    """The price levels of one side of a book, in arrays sorted by price."""
+
+    def __init__(self) -> None:
+        self.prices = array("d")
+        self.volumes = array("q")
+        self.orders = array("q")
+        # the cumulative volumes, rebuilt lazily after a change.
+        self._cumulative: Optional[array] = None
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def as_dict(self) -> Dict[float, Tuple[int, int]]:
+        return dict(zip(self.prices, zip(self.volumes, self.orders)))
+
+    def set(self, price: float, volume: int, orders: int) -> None:
+        """Updates, inserts or (with a volume of 0) removes a level."""
+        self._cumulative = None
+        index = bisect_left(self.prices, price)
+        exists = index < len(self.prices) and self.prices[index] == price
+        if not volume:
+            if exists:
+                del self.prices[index]
+                del self.volumes[index]
+                del self.orders[index]
+        elif exists:
+            self.volumes[index] = volume
+            self.orders[index] = orders
+        else:
+            self.prices.insert(index, price)
+            self.volumes.insert(index, volume)
+            self.orders.insert(index, orders)
+
+    def cumulative(self) -> array:
+        """The volume of the levels up to each index, starting from 0."""
+        if self._cumulative is None:
+            self._cumulative = array("q", accumulate(self.volumes, initial=0))
+        return self._cumulative
+
+
+class OrderBook:
+    """The aggregated depth of a symbol, updated from each new snapshot.
+
+    Both sides are kept sorted by price in compact arrays, so that the
+    best prices and the cumulative depth are found in O(log n).
+    """
+
+    def __init__(self, ticker: str):
+        self.ticker = ticker
+        self._sides = {BookSide.BUY: _Levels(), BookSide.SELL: _Levels()}
+
+    def levels(self, side: BookSide) -> List[Tuple[float, int, int]]:
+        """The (price, volume, number of orders) of each level, best first."""
+        levels = self._sides[side]
+        rows = list(zip(levels.prices, levels.volumes, levels.orders))
+        return rows[::-1] if side == BookSide.BUY else rows
+
+    def apply(self, snapshot: Mapping) -> List[DepthChange]:
+        """Updates the book to match a depth snapshot.
+
+        Args:
+            snapshot (Mapping): the json returned by the aggregated depth
+                endpoint, the levels without a price or a volume are ignored.
+
+        Returns:
+            List[DepthChange]: the levels which changed.
+        """
+        changes = []
+        for side, key in ((BookSide.BUY, "buyOrders"), (BookSide.SELL, "sellOrders")):
+            levels = self._sides[side]
+            current = levels.as_dict()
+            for level in snapshot.get(key) or ():
+                price, volume = level.get("price"), level.get("volume")
+                if price is None or volume is None:
+                    # an incomplete level leaves the book as it was.
+                    current.pop(price, None)
+                    continue
+                values = (volume, level.get("numberOfOrders") or 0)
+                if current.pop(price, None) != values:
+                    changes.append(DepthChange(side, price, *values))
+            # the levels missing from the snapshot are gone.
+            changes += [DepthChange(side, price, 0, 0) for price in current]
+
+        for change in changes:
+            self._sides[change.side].set(
+                change.price, change.volume, change.number_of_orders
+            )
+        return changes
+
+    @property
+    def best_bid(self) -> Optional[float]:
+        prices = self._sides[BookSide.BUY].prices
+        return prices[-1] if prices else None
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        prices = self._sides[BookSide.SELL].prices
+        return prices[0] if prices else None
+
+    @property
+    def spread(self) -> Optional[float]:
+        if self.best_bid is None or self.best_ask is None:
+            return None
+        return self.best_ask - self.best_bid
+
+    def depth(self, side: BookSide, price: float) -> int:
+        """The volume available at the price or better: the volume bid at
+        or above the price, or offered at or below it."""
+        levels = self._sides[side]
+        cumulative = levels.cumulative()
+        if side == BookSide.BUY:
+            return cumulative[-1] - cumulative[bisect_left(levels.prices, price)]
+        return cumulative[bisect_right(levels.prices, price)]
+
+
+class DepthTracker(BaseClient):
+    """Keeps the order books of ASX symbols up to date.
+
+    The depth snapshots are applied straight from the json, without
+    building the ProductAggregatedDepth models.
+    """
+
+    def __init__(self, client: "StakeClient"):
+        super().__init__(client)
+        self.books: Dict[str, OrderBook] = {}
+
+    async def update(self, symbol: str) -> List[DepthChange]:
+        """Fetches the depth of the symbol, and applies it to its book.
+
+        Returns:
+            List[DepthChange]: the levels which changed since the last update.
+        """
+        data = await self._client.get(
+            self._client.exchange.aggregated_depth.format(symbol=symbol)
+        )
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = OrderBook(data.get("ticker") or symbol)
+        return book.apply(data)
+
+    async def follow(
+        self, symbols: Iterable[str], interval: float = 1.0
+    ) -> AsyncIterator[Tuple[str, List[DepthChange]]]:
+        """Polls the depth of the symbols concurrently every `interval`
+        seconds, yielding the symbols whose book changed with the changes.
+
+        Examples:
+            tracker = DepthTracker(client)
+            async for symbol, changes in tracker.follow(["ORG", "CBA"]):
+                print(symbol, tracker.books[symbol].spread)
+        """
+        symbols = list(dict.fromkeys(symbols))
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            updates = await asyncio.gather(*map(self.update, symbols))
+            for symbol, changes in zip(symbols, updates):
+                if changes:
+                    yield symbol, changes
+            await asyncio.sleep(max(0.0, started + interval - loop.time()))
@@ -1,4 +1,4 @@
-import json
+import math
 from datetime import datetime
 from enum import Enum
 from typing import List, Optional
@@ -8,7 +8,7 @@ from pydantic import BaseModel, ConfigDict, Field
 from pydantic.types import UUID
 
 from stake.asx.transaction import Sort
-from stake.common import BaseClient, camelcase
+from stake.common import BaseClient, camelcase, gather_bounded
 
 __all__ = ["FundingRequest", "FundingStatus"]
 
@@ -60,11 +60,7 @@ class FundingRequest(BaseModel):
 
     def as_url_params(self) -> str:
         """Returns the parameters for the GET request."""
-        data = json.loads(
-            self.model_dump_json(
-                exclude_none=True,
-            )
-        )
+        data = self.model_dump(mode="json", exclude_none=True)
         if data.get("sort"):
             data["sort"] = [f"{d['attribute']},{d['direction']}" for d in data["sort"]]
 
@@ -135,6 +131,61 @@ class FundingsClient(BaseClient):
 
         return Fundings(**data)
 
+    async def list_all(self, request: FundingRequest, concurrency: int = 5) -> Fundings:
+        """Returns all the funding transactions matching the request, from the
+        request's offset page onwards.
+
+        Once the first page reveals the total number of records, the
+        remaining pages are fetched concurrently and merged back in page
+        order, thus respecting the requested sort.
+
+        Args:
+            request (FundingRequest): the funding request, its limit is
+                used as the page size.
+            concurrency (int): how many pages can be fetched at the same time.
+
+        Returns:
+            Fundings: all the fundings retrieved.
+        """
+        first_page = await self.list(request)
+        pages = [first_page]
+
+        if first_page.has_next and first_page.total_items:
+            last_page = math.ceil(first_page.total_items / request.limit)
+            pages += await gather_bounded(
+                *[
+                    self.list(request.model_copy(update={"offset": page}))
+                    for page in range(request.offset + 1, last_page)
+                ],
+                limit=concurrency,
+            )
+        elif first_page.has_next:
+            # the total is unknown, so we can only go one page at a time.
+            page_request = request
+            while pages[-1].has_next and pages[-1].fundings:
+                page_request = page_request.model_copy(
+                    update={"offset": page_request.offset + 1}
+                )
+                pages.append(await self.list(page_request))
+
+        # records inserted while paging can shift the pages, drop the duplicates.
+        seen = set()
+        fundings = []
+        for page in pages:
+            for funding in page.fundings or []:
+                if funding.id is not None:
+                    if funding.id in seen:
+                        continue
+                    seen.add(funding.id)
+                fundings.append(funding)
+
+        return Fundings(
+            items=fundings,
+            hasNext=False,
+            page=first_page.page,
+            totalItems=first_page.total_items,
+        )
+
     async def in_flight(self) -> Fundings:
         """Returns the funds currently in flight."""
         request = FundingRequest(
@@ -1,10 +1,14 @@
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import pydantic
 from pydantic import ConfigDict
 
 from stake.common import BaseClient, camelcase
+from stake.market import MarketStatusCache
+
+if TYPE_CHECKING:  # pragma: no cover
+    from stake.client import StakeClient
 
 __all__ = ["MarketStatus"]
 
@@ -20,15 +24,28 @@ class MarketStatus(pydantic.BaseModel):
 
 
 class MarketClient(BaseClient):
-    """Retrieves informations about the current status of the market."""
+    """Retrieves informations about the current status of the market.
 
-    async def get(self) -> MarketStatus:
+    The ASX status does not tell when it changes next, so it is cached for
+    `cache.max_staleness` seconds.
+    """
+
+    def __init__(self, client: "StakeClient"):
+        super().__init__(client)
+        self.cache: MarketStatusCache[MarketStatus] = MarketStatusCache(self._fetch)
+
+    async def _fetch(self) -> MarketStatus:
         data = await self._client.get(self._client.exchange.market_status)
         return MarketStatus(
             last_trading_date=data[0]["lastTradedTimestamp"],
             status=Status(current=data[0]["marketStatus"]),
         )
 
+    async def get(self) -> MarketStatus:
+        """Fetches the current status of the market, refreshing the cache."""
+        return await self.cache.refresh()
+
     async def is_open(self) -> bool:
-        status = await self.get()
+        """Whether the market is open, from the cached status when fresh."""
+        status = await self.cache.get()
         return status.status.current == "open"
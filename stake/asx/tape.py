@@ -0,0 +1,146 @@
+import asyncio
+from collections import deque
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Set,
+)
+
+from stake.asx.product import CourseOfSale
+from stake.common import BaseClient
+
+if TYPE_CHECKING:  # pragma: no cover
+    from stake.client import StakeClient
+
+__all__ = ["SaleEvent", "CourseOfSalesFollower"]
+
+
+class SaleEvent(NamedTuple):
+    """A print of the course of sales of a symbol: a new trade, or the
+    cancellation of a trade."""
+
+    symbol: str
+    sale: CourseOfSale
+    cancelled: bool
+
+
+class _Cursor:
+    """How far the course of sales of a symbol has been read."""
+
+    __slots__ = ("millis", "ids", "cancelled", "_cancelled_order")
+
+    def __init__(self, history: int):
+        # the newest trade time seen, and the ids of the trades at that time.
+        self.millis = -1
+        self.ids: Set[str] = set()
+        # the ids of the last `history` cancellations reported.
+        self.cancelled: Set[str] = set()
+        self._cancelled_order: Deque[str] = deque(maxlen=history)
+
+    def is_new(self, millis: int, id_: str) -> bool:
+        return millis > self.millis or (millis == self.millis and id_ not in self.ids)
+
+    def advance(self, millis: int, id_: str) -> None:
+        if millis > self.millis:
+            self.millis = millis
+            self.ids = {id_}
+        elif millis == self.millis:
+            self.ids.add(id_)
+
+    def cancel(self, id_: str) -> None:
+        if len(self._cancelled_order) == self._cancelled_order.maxlen:
+            self.cancelled.discard(self._cancelled_order[0])
+        self._cancelled_order.append(id_)
+        self.cancelled.add(id_)
+
+
+class CourseOfSalesFollower(BaseClient):
+    """Follows the course of sales of ASX symbols, only reporting the prints
+    which have not been seen yet.
+
+    The responses are scanned as json, only the new prints are parsed
+    into CourseOfSale models.
+    """
+
+    def __init__(self, client: "StakeClient", history: int = 10_000):
+        """
+        Args:
+            client (StakeClient): the ASX client.
+            history (int): how many cancellations are remembered per symbol,
+                so that each is reported once.
+        """
+        super().__init__(client)
+        self.history = history
+        self.cursors: Dict[str, _Cursor] = {}
+
+    def _events(self, symbol: str, sales: Iterable[Mapping]) -> List[SaleEvent]:
+        cursor = self.cursors.get(symbol)
+        if cursor is None:
+            cursor = self.cursors[symbol] = _Cursor(self.history)
+
+        new = []
+        cancelled = []
+        for sale in sales:
+            millis = sale.get("tradeTimeMillis")
+            id_ = sale.get("id")
+            if millis is None or id_ is None:
+                continue
+            if cursor.is_new(millis, id_):
+                new.append(sale)
+            elif sale.get("cancelledTimeMillis") is not None:
+                if id_ not in cursor.cancelled:
+                    cancelled.append(sale)
+
+        events = []
+        # the new prints are reported in chronological order.
+        for sale in sorted(new, key=lambda sale: sale["tradeTimeMillis"]):
+            cursor.advance(sale["tradeTimeMillis"], sale["id"])
+            is_cancelled = sale.get("cancelledTimeMillis") is not None
+            if is_cancelled:
+                cursor.cancel(sale["id"])
+            events.append(SaleEvent(symbol, CourseOfSale(**sale), is_cancelled))
+        for sale in sorted(cancelled, key=lambda sale: sale["cancelledTimeMillis"]):
+            cursor.cancel(sale["id"])
+            events.append(SaleEvent(symbol, CourseOfSale(**sale), True))
+        return events
+
+    async def poll(self, symbol: str) -> List[SaleEvent]:
+        """Fetches the course of sales of the symbol.
+
+        Returns:
+            List[SaleEvent]: the trades which were not reported yet, oldest
+                first, followed by the new cancellations.
+        """
+        data = await self._client.get(
+            self._client.exchange.course_of_sales.format(symbol=symbol)
+        )
+        return self._events(symbol, data.get("courseOfSales") or ())
+
+    async def follow(
+        self, symbols: Iterable[str], interval: float = 1.0
+    ) -> AsyncIterator[SaleEvent]:
+        """Polls the course of sales of the symbols concurrently every
+        `interval` seconds, yielding the new prints and cancellations.
+
+        The first poll of each symbol reports the whole course of sales
+        returned by the api.
+
+        Examples:
+            follower = CourseOfSalesFollower(client)
+            async for event in follower.follow(["ORG", "CBA"]):
+                print(event.symbol, event.sale.price, event.cancelled)
+        """
+        symbols = list(dict.fromkeys(symbols))
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            for events in await asyncio.gather(*map(self.poll, symbols)):
+                for event in events:
+                    yield event
+            await asyncio.sleep(max(0.0, started + interval - loop.time()))
@@ -0,0 +1,238 @@
+import mmap
+import re
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from stake.asx.product import CourseOfSale
+
+__all__ = ["Ticks", "TickStore"]
+
+Typecode = Literal["q", "d"]
+
+# the name and array typecode of each column.
+COLUMNS: Tuple[Tuple[str, Typecode], ...] = (
+    ("time", "q"),
+    ("price", "d"),
+    ("volume", "q"),
+    ("value", "d"),
+)
+
+_VALID_SYMBOL = re.compile(r"[A-Za-z0-9._-]+")
+
+
+class Ticks(NamedTuple):
+    """The columns of a range of ticks, the time is in epoch milliseconds."""
+
+    time: array
+    price: array
+    volume: array
+    value: array
+
+
+def _range(times: Sequence[int], start: Optional[int], end: Optional[int]) -> slice:
+    lo = 0 if start is None else bisect_left(times, start)
+    hi = len(times) if end is None else bisect_left(times, end, lo)
+    return slice(lo, hi)
+
+
+class _Series:
+    """The ticks of a symbol: the newest in memory, the oldest spilled to
+    one file per column and memory mapped."""
+
+    def __init__(self, symbol: str, directory: Optional[Path]):
+        self.symbol = symbol
+        self.directory = directory
+        self.memory: Dict[str, array] = {name: array(code) for name, code in COLUMNS}
+        self._mapped: Dict[str, Tuple[mmap.mmap, "memoryview[Any]"]] = {}
+
+    def path(self, column: str) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{self.symbol}.{column}.bin"
+
+    def disk(self, column: str) -> "memoryview[Any]":
+        """The spilled values of the column, as a memory mapped view."""
+        typecode = dict(COLUMNS)[column]
+        if self.directory is None:
+            return memoryview(b"").cast(typecode)
+        if column not in self._mapped:
+            path = self.path(column)
+            if not path.exists() or not path.stat().st_size:
+                return memoryview(b"").cast(typecode)
+            with path.open("rb") as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped[column] = (mapped, memoryview(mapped).cast(typecode))
+        return self._mapped[column][1]
+
+    @property
+    def last_time(self) -> Optional[int]:
+        for times in (self.memory["time"], self.disk("time")):
+            if len(times):
+                return times[-1]
+        return None
+
+    def __len__(self) -> int:
+        return len(self.disk("time")) + len(self.memory["time"])
+
+    def spill(self) -> None:
+        """Appends the ticks held in memory to the column files."""
+        if self.directory is None or not self.memory["time"]:
+            return
+        self.unmap()
+        for name, values in self.memory.items():
+            with self.path(name).open("ab") as file:
+                values.tofile(file)
+            del values[:]
+
+    def unmap(self) -> None:
+        for mapped, view in self._mapped.values():
+            view.release()
+            mapped.close()
+        self._mapped.clear()
+
+    def ticks(self, start: Optional[int], end: Optional[int]) -> Ticks:
+        on_disk = _range(self.disk("time"), start, end)
+        in_memory = _range(self.memory["time"], start, end)
+        columns = []
+        for name, code in COLUMNS:
+            values = array(code)
+            disk = self.disk(name)
+            if len(disk):
+                values.frombytes(disk[on_disk].cast("B"))
+            values.extend(self.memory[name][in_memory])
+            columns.append(values)
+        return Ticks(*columns)
+
+
+class TickStore:
+    """Keeps the course of sales ticks of many symbols in compact columns:
+    32 bytes per tick.
+
+    The ticks of each symbol are appended in memory and, when a directory
+    is given, spilled to memory mapped files once there are more than
+    `spill_threshold` of them. A store reopened on the same directory reads
+    the ticks spilled before.
+
+    Examples:
+        store = TickStore("ticks")
+        async for event in CourseOfSalesFollower(client).follow(symbols):
+            if not event.cancelled:
+                store.append(event.symbol, [event.sale])
+        store.ticks("ORG", start=opening_millis)
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path, None] = None,
+        spill_threshold: int = 100_000,
+    ):
+        """
+        Args:
+            directory (Union[str, Path], optional): where to spill the ticks,
+                they are only kept in memory when None.
+            spill_threshold (int): how many ticks of a symbol are kept in
+                memory before being spilled.
+        """
+        self.directory = Path(directory) if directory is not None else None
+        self.spill_threshold = spill_threshold
+        self._series: Dict[str, _Series] = {}
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for path in self.directory.glob("*.time.bin"):
+                self._get(path.name[: -len(".time.bin")])
+
+    def _get(self, symbol: str) -> _Series:
+        series = self._series.get(symbol)
+        if series is None:
+            if not _VALID_SYMBOL.fullmatch(symbol):
+                raise ValueError(f"Invalid symbol: {symbol!r}")
+            series = self._series[symbol] = _Series(symbol, self.directory)
+        return series
+
+    @property
+    def symbols(self) -> List[str]:
+        return sorted(self._series)
+
+    def __len__(self) -> int:
+        return sum(len(series) for series in self._series.values())
+
+    def count(self, symbol: str) -> int:
+        series = self._series.get(symbol)
+        return len(series) if series else 0
+
+    def append_tick(
+        self, symbol: str, time: int, price: float, volume: int, value: float
+    ) -> None:
+        """Appends a single tick, ticks must be appended in time order.
+
+        Raises:
+            ValueError: if the tick is older than the last one of the symbol.
+        """
+        series = self._get(symbol)
+        last_time = series.last_time
+        if last_time is not None and time < last_time:
+            raise ValueError(
+                f"The {symbol} ticks must be appended in time order: "
+                f"{time} is older than {last_time}."
+            )
+        memory = series.memory
+        memory["time"].append(int(time))
+        memory["price"].append(float(price))
+        memory["volume"].append(int(volume))
+        memory["value"].append(float(value))
+        if len(memory["time"]) >= self.spill_threshold:
+            series.spill()
+
+    def append(self, symbol: str, sales: Iterable[CourseOfSale]) -> None:
+        """Appends course of sales prints, in time order.
+
+        The prints are stored as they are: leave out the cancelled ones.
+        Prints without a trade time or a price are skipped.
+        """
+        for sale in sales:
+            if sale.trade_time_millis is None or sale.price is None:
+                continue
+            self.append_tick(
+                symbol,
+                sale.trade_time_millis,
+                sale.price,
+                sale.volume or 0,
+                sale.value or 0.0,
+            )
+
+    def ticks(
+        self, symbol: str, start: Optional[int] = None, end: Optional[int] = None
+    ) -> Ticks:
+        """Returns the ticks of the symbol traded from `start` (included) to
+        `end` (excluded), in epoch milliseconds.
+
+        The range is found by bisecting the time column, and only the
+        ticks within it are copied out of the store.
+        """
+        series = self._series.get(symbol)
+        if series is None:
+            return Ticks(*(array(code) for _, code in COLUMNS))
+        return series.ticks(start, end)
+
+    def spill(self) -> None:
+        """Spills the ticks held in memory, when the store has a directory."""
+        for series in self._series.values():
+            series.spill()
+
+    def close(self) -> None:
+        """Spills the ticks held in memory, and closes the mapped files."""
+        self.spill()
+        for series in self._series.values():
+            series.unmap()
@@ -1,12 +1,19 @@
+import asyncio
+import time
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Union
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator, validate_call
 
 from stake.asx.common import TradeType
 from stake.asx.order import Order
-from stake.common import BaseClient, camelcase
+from stake.asx.product import Product
+from stake.cache import PersistentCache
+from stake.common import BaseClient, camelcase, gather_bounded
+
+if TYPE_CHECKING:  # pragma: no cover
+    from stake.client import StakeClient
 
 __all__ = [
     "LimitBuyRequest",
@@ -69,9 +76,35 @@ class MarketSellRequest(GenericTradeRequest):
     price: Optional[float] = None
 
 
+TradeRequest = Union[
+    MarketBuyRequest,
+    LimitBuyRequest,
+    LimitSellRequest,
+    MarketSellRequest,
+]
+
+
+class BatchTradeResult(BaseModel):
+    """The outcome of one of the trades submitted in a batch."""
+
+    request: TradeRequest
+    order: Optional[Order] = None
+    error: Optional[Exception] = None
+    elapsed: float  # seconds taken to submit the trade.
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
 class TradesClient(BaseClient):
     """This client is used to buy/sell equities."""
 
+    def __init__(self, client: "StakeClient"):
+        super().__init__(client)
+        # maps the ASX symbols to their instrument id, it is persisted in
+        # the STAKE_CACHE_DIR directory, if set.
+        self.instrument_index = PersistentCache(
+            client.cache_database, table="instrument_ids"
+        )
+
     @validate_call
     async def _trade(
         self,
@@ -91,10 +124,8 @@ class TradesClient(BaseClient):
         Returns:
             the Order
         """
-        if not request.instrument_code and request.symbol:
-            # in this case we need to get the instrument name from the symbol
-            instrument_id = await self._instrument_id_from_symbol(request.symbol)
-            request.instrument_code = instrument_id
+        # in case we only have the symbol, we need to get the instrument name
+        await self._set_instrument_code(request)
 
         data = await self._client.post(
             url, payload=request.model_dump(by_alias=True, exclude={"symbol"})
@@ -104,9 +135,43 @@ class TradesClient(BaseClient):
 
     async def _instrument_id_from_symbol(self, symbol: str) -> str:
         """Returns the instrument_id from an associated product."""
+        instrument_id = self.instrument_index.get(symbol)
+        if instrument_id:
+            return instrument_id
+
         url = self._client.exchange.instrument_from_symbol.format(symbol=symbol)
         data = await self._client.post(url, payload={})
-        return data["instrumentId"]
+        instrument_id = data["instrumentId"]
+        self.instrument_index.set(symbol, instrument_id)
+        return instrument_id
+
+    async def _set_instrument_code(
+        self,
+        request: Union[
+            MarketBuyRequest, LimitBuyRequest, MarketSellRequest, LimitSellRequest
+        ],
+    ) -> None:
+        if not request.instrument_code and request.symbol:
+            request.instrument_code = await self._instrument_id_from_symbol(
+                request.symbol
+            )
+
+    async def _set_price(
+        self,
+        request: Union[
+            MarketBuyRequest, LimitBuyRequest, MarketSellRequest, LimitSellRequest
+        ],
+        price_attribute: str,
+    ) -> None:
+        """Sets the current bid/ask price for the symbol, if the request has no
+        price."""
+        if request.price is not None:
+            return
+        product = await self._client.products.get(request.symbol)
+        assert product
+        price = getattr(product, price_attribute)
+        assert price
+        request.price = price
 
     async def buy(self, request: Union[MarketBuyRequest, LimitBuyRequest]) -> Order:
         """Creates an order to buy equities.
@@ -120,11 +185,10 @@ class TradesClient(BaseClient):
         # if the price has not been set(in the case of a market order),
         # we get the current ask price for that symbol. This seems to
         # be what the app is doing, the price value cannot be left null.
-        if request.price is None:
-            product = await self._client.products.get(request.symbol)
-            assert product
-            assert product.ask
-            request.price = product.ask
+        # The instrument code is looked up at the same time.
+        await asyncio.gather(
+            self._set_price(request, "ask"), self._set_instrument_code(request)
+        )
 
         return await self._trade(self._client.exchange.orders, request)
 
@@ -138,10 +202,92 @@ class TradesClient(BaseClient):
             the Order object
         """
         # if the price has not been set, we get the current bid price for that symbol.
-        if request.price is None:
-            product = await self._client.products.get(request.symbol)
-            assert product
-            assert product.bid
-            request.price = product.bid
+        await asyncio.gather(
+            self._set_price(request, "bid"), self._set_instrument_code(request)
+        )
 
         return await self._trade(self._client.exchange.orders, request)
+
+    async def submit_batch(
+        self, requests: Sequence[TradeRequest], concurrency: int = 5
+    ) -> List[BatchTradeResult]:
+        """Submits a basket of buy/sell trades at once.
+
+        The instrument code and the current price (for the requests without
+        one) are only looked up once per symbol, the trades are then
+        submitted concurrently. A failing trade does not stop the others.
+
+        Args:
+            requests: the buy/sell requests.
+            concurrency: the maximum number of trades submitted at the same
+                time.
+
+        Returns:
+            List[BatchTradeResult]: the result of each request, in order.
+        """
+        instrument_symbols = list(
+            dict.fromkeys(
+                request.symbol
+                for request in requests
+                if request.symbol and not request.instrument_code
+            )
+        )
+        price_symbols = list(
+            dict.fromkeys(
+                request.symbol
+                for request in requests
+                if request.symbol and request.price is None
+            )
+        )
+        lookups = await asyncio.gather(
+            *[self._instrument_id_from_symbol(s) for s in instrument_symbols],
+            *[self._client.products.get(s) for s in price_symbols],
+            return_exceptions=True,
+        )
+        instrument_ids: Dict[str, Union[str, BaseException]] = dict(
+            zip(instrument_symbols, lookups[: len(instrument_symbols)])
+        )
+        products: Dict[str, Union[Optional[Product], BaseException]] = dict(
+            zip(price_symbols, lookups[len(instrument_symbols) :])
+        )
+
+        async def _submit(request: TradeRequest) -> BatchTradeResult:
+            started = time.perf_counter()
+            try:
+                if not request.instrument_code and request.symbol:
+                    instrument_id = instrument_ids[request.symbol]
+                    if isinstance(instrument_id, BaseException):
+                        raise instrument_id
+                    request.instrument_code = instrument_id
+                if request.price is None:
+                    if not request.symbol:
+                        raise ValueError(
+                            "A symbol is needed to price a request without one."
+                        )
+                    product = products[request.symbol]
+                    if isinstance(product, BaseException):
+                        raise product
+                    if product is None:
+                        raise ValueError(f"Could not find the symbol {request.symbol}.")
+                    # buy at the ask price, sell at the bid one.
+                    price = product.ask if request.side == "BUY" else product.bid
+                    if not price:
+                        raise ValueError(f"No price available for {request.symbol}.")
+                    request.price = price
+
+                order = await self._trade(self._client.exchange.orders, request)
+                return BatchTradeResult(
+                    request=request,
+                    order=order,
+                    elapsed=time.perf_counter() - started,
+                )
+            except Exception as error:
+                return BatchTradeResult(
+                    request=request,
+                    error=error,
+                    elapsed=time.perf_counter() - started,
+                )
+
+        return await gather_bounded(
+            *[_submit(request) for request in requests], limit=concurrency
+        )
@@ -1,7 +1,7 @@
-import json
+import asyncio
 from datetime import date, datetime
 from enum import Enum
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Union
 from urllib.parse import urlencode
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -37,11 +37,7 @@ class TransactionRecordRequest(BaseModel):
 
     def as_url_params(self) -> str:
         """Returns the parameters for the GET request."""
-        data = json.loads(
-            self.model_dump_json(
-                exclude_none=True,
-            )
-        )
+        data = self.model_dump(mode="json", exclude_none=True)
         if data.get("sort", None):
             data["sort"] = [f"{d['attribute']},{d['direction']}" for d in data["sort"]]
 
@@ -94,8 +90,64 @@ class TransactionsClient(BaseClient):
             Transactions: The matching transactions
         """
 
-        data: dict = await self._client.get(
+        data = await self._client.get_raw(
             f"{self._client.exchange.trade_activity}?{request.as_url_params()}"
         )
 
-        return Transactions(**data)
+        return Transactions.model_validate_json(data)
+
+    async def iter_all(
+        self, request: TransactionRecordRequest, prefetch: int = 1
+    ) -> AsyncIterator[Transaction]:
+        """Iterates over all the transactions matching the request, one page
+        after the other starting from the request's offset.
+
+        The next pages are fetched while the current one is being consumed,
+        only keeping up to `prefetch` pages in memory.
+
+        Examples:
+            async for transaction in client.transactions.iter_all(request):
+                ...
+
+        Args:
+            request (TransactionRecordRequest):
+                used to filter the transactions and set the page size.
+            prefetch (int): how many pages to fetch ahead.
+
+        Yields:
+            Transaction: the matching transactions.
+        """
+        if prefetch < 1:
+            raise ValueError("'prefetch' must be at least 1.")
+
+        pages: asyncio.Queue[Union[Transactions, Exception]] = asyncio.Queue(
+            maxsize=prefetch
+        )
+
+        async def _fetch_pages() -> None:
+            page_request = request.model_copy()
+            while True:
+                try:
+                    page = await self.list(page_request)
+                except Exception as error:
+                    await pages.put(error)
+                    return
+                await pages.put(page)
+                if not page.has_next or not page.transactions:
+                    return
+                page_request = page_request.model_copy(
+                    update={"offset": page_request.offset + 1}
+                )
+
+        producer = asyncio.ensure_future(_fetch_pages())
+        try:
+            while True:
+                page = await pages.get()
+                if isinstance(page, Exception):
+                    raise page
+                for transaction in page.transactions or []:
+                    yield transaction
+                if not page.has_next or not page.transactions:
+                    return
+        finally:
+            producer.cancel()
@@ -0,0 +1,249 @@
+"""Caches used to avoid repeating requests for data that rarely changes."""
+
+import json
+import os
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Hashable,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from pydantic import BaseModel
+
+__all__ = ["CacheDatabase", "CacheStats", "PersistentCache", "TTLCache"]
+
+IN_MEMORY = ":memory:"
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheStats(BaseModel):
+    """Counters describing how a cache is performing."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # entries dropped to make room for new ones.
+    expirations: int = 0  # entries dropped because their ttl expired.
+
+
+class TTLCache(Generic[K, V]):
+    """A bounded LRU cache whose entries expire after a time-to-live.
+
+    Examples:
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("TSLA", product_data)
+        cache.get("TSLA")
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 3600.0,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            maxsize (int): the maximum number of entries, the least recently
+                used ones are evicted first.
+            ttl (float): the default time-to-live of an entry, in seconds.
+            timer (Callable[[], float]): the clock used to expire the entries.
+        """
+        if maxsize <= 0:
+            raise ValueError("'maxsize' must be a positive number.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.stats = CacheStats()
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+
+    def get(self, key: K) -> Optional[V]:
+        """Returns the cached value, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self.timer():
+            del self._data[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """Stores a value, optionally overriding the default time-to-live."""
+        expires_at = self.timer() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        """Removes a key from the cache, if present."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key: K) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > self.timer()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def cache_path(filename: str) -> str:
+    """Returns the path of a persistent cache file.
+
+    The caches are kept in the STAKE_CACHE_DIR directory, or in memory
+    when that env-var is not set.
+    """
+    cache_dir = os.getenv("STAKE_CACHE_DIR")
+    return os.path.join(cache_dir, filename) if cache_dir else IN_MEMORY
+
+
+def connect(path: Union[str, Path] = IN_MEMORY) -> sqlite3.Connection:
+    """Opens a SQLite database in autocommit mode, creating its directory if
+    needed."""
+    path = str(path)
+    if path != IN_MEMORY:
+        path = os.path.expanduser(path)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+    connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    if path != IN_MEMORY:
+        # lets other processes read while we write.
+        connection.execute("PRAGMA journal_mode=WAL")
+    return connection
+
+
+class CacheDatabase:
+    """A SQLite database holding the tables of several persistent caches over a
+    single connection.
+
+    The connection is opened when first used, and opened again if used
+    after being closed.
+
+    Examples:
+        database = CacheDatabase("~/.stake/stake.sqlite3")
+        index = PersistentCache(database, table="instruments")
+        details = PersistentCache(database, table="details")
+        database.close()
+    """
+
+    def __init__(self, path: Union[str, Path] = IN_MEMORY):
+        """
+        Args:
+            path (Union[str, Path]): the SQLite database file, defaults to
+                an in-memory database.
+        """
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._tables: Set[str] = set()
+
+    def connection(self, table: str) -> sqlite3.Connection:
+        """Returns the connection, creating the cache table if needed."""
+        if self._connection is None:
+            self._connection = connect(self.path)
+            self._tables.clear()
+        if table not in self._tables:
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._tables.add(table)
+        return self._connection
+
+    def close(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            connection.close()
+
+
+class PersistentCache:
+    """A key/value store of json serializable values, persisted in a SQLite
+    table so that it can be reused across processes.
+
+    Examples:
+        index = PersistentCache("~/.stake/asx.sqlite3", table="instruments")
+        index.set("COL", "3c5b8f4e-...")
+        index.get("COL")
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path, CacheDatabase] = IN_MEMORY,
+        table: str = "cache",
+    ):
+        """
+        Args:
+            path (Union[str, Path, CacheDatabase]): the SQLite database file,
+                defaults to an in-memory database, or a CacheDatabase shared
+                with other caches.
+            table (str): the table holding the values, several caches
+                can share the same database file.
+        """
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", table):
+            raise ValueError(f"Invalid table name {table!r}.")
+        self.table = table
+        # the cache only closes the database it opened itself.
+        self._owns_database = not isinstance(path, CacheDatabase)
+        self.database = path if isinstance(path, CacheDatabase) else CacheDatabase(path)
+        self.database.connection(self.table)
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        return self.database.connection(self.table)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the stored value, or None if missing."""
+        row = self._connection.execute(
+            f"SELECT value FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any) -> None:
+        self._connection.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, updated_at) "
+            "VALUES (?, ?, ?)",
+            (key, json.dumps(value), time.time()),
+        )
+
+    def invalidate(self, key: str) -> None:
+        """Removes a key from the cache, if present."""
+        self._connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        if self._owns_database:
+            self.database.close()
+
+    def __contains__(self, key: object) -> bool:
+        return (
+            self._connection.execute(
+                f"SELECT 1 FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            is not None
+        )
+
+    def __len__(self) -> int:
+        return self._connection.execute(
+            f"SELECT COUNT(*) FROM {self.table}"
+        ).fetchone()[0]
@@ -1,6 +1,9 @@
+import asyncio
 import logging
 import os
-from typing import Optional, Union
+import warnings
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Tuple, Type, Union
 
 import aiohttp
 from dotenv import load_dotenv
@@ -22,13 +25,22 @@ from stake import (
     user,
     watchlist,
 )
+from stake.cache import CacheDatabase, cache_path
+from stake.codec import JsonCodec, default_codec
 from stake.common import camelcase
+from stake.ratelimit import RateLimiter, retry_after
+from stake.retry import RetryPolicy
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["StakeClient", "CredentialsLoginRequest", "SessionTokenLoginRequest"]
+__all__ = [
+    "StakeClient",
+    "ConnectionPoolSettings",
+    "CredentialsLoginRequest",
+    "SessionTokenLoginRequest",
+]
 
 
 class CredentialsLoginRequest(BaseModel):
@@ -54,8 +66,34 @@ class Headers(BaseModel):
     stake_session_token: Optional[str] = Field("", alias="Stake-Session-Token")
 
 
+class ConnectionPoolSettings(BaseModel):
+    """Tunes the connection pool shared by all the requests of a
+    StakeClient."""
+
+    limit: int = 100  # total number of simultaneous connections, 0 is unlimited.
+    limit_per_host: int = 20  # simultaneous connections to the same host.
+    keepalive_timeout: float = 30.0  # seconds an idle connection is kept open.
+    ttl_dns_cache: Optional[int] = 300  # seconds, None caches forever.
+
+    def connector(self) -> aiohttp.TCPConnector:
+        """Builds the connector backing the pooled session.
+
+        Needs to be called from within a running event loop.
+        """
+        return aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+        )
+
+
 class HttpClient:
-    """Handles http calls to the Stake API."""
+    """Handles http calls to the Stake API.
+
+    Every call opens (and closes) its own session, this is used as a
+    fallback when the StakeClient is not used as a context manager.
+    """
 
     @staticmethod
     def url(endpoint: str) -> str:
@@ -72,39 +110,79 @@ class HttpClient:
 
     @staticmethod
     async def get(
-        url: str, payload: dict | None = None, headers: dict | None = None
+        url: str, payload: dict | None = None, headers: Mapping[str, str] | None = None
     ) -> dict:
-        async with aiohttp.ClientSession(
-            headers=headers, raise_for_status=True
-        ) as session:
-            response = await session.get(
-                HttpClient.url(url), headers=headers, json=payload
-            )
-            return await response.json()
+        """Deprecated, use StakeClient.get or HttpClient.request instead."""
+        return await HttpClient._json_request("get", url, payload, headers)
 
     @staticmethod
-    async def post(url: str, payload: dict, headers: dict | None = None) -> dict:
-
-        async with aiohttp.ClientSession(
-            headers=headers, raise_for_status=True
-        ) as session:
-            logger.debug("POST %s %s", url, payload)
-            response = await session.post(
-                HttpClient.url(url), headers=headers, json=payload
-            )
-            return await response.json()
+    async def post(
+        url: str, payload: dict, headers: Mapping[str, str] | None = None
+    ) -> dict:
+        """Deprecated, use StakeClient.post or HttpClient.request instead."""
+        return await HttpClient._json_request("post", url, payload, headers)
 
     @staticmethod
     async def delete(
-        url: str, payload: dict | None = None, headers: dict | None = None
+        url: str, payload: dict | None = None, headers: Mapping[str, str] | None = None
     ) -> dict:
+        """Deprecated, use StakeClient.delete or HttpClient.request instead."""
+        return await HttpClient._json_request("delete", url, payload, headers)
+
+    @staticmethod
+    async def _json_request(
+        method: str,
+        url: str,
+        payload: dict | None,
+        headers: Mapping[str, str] | None,
+    ) -> Any:
+        warnings.warn(
+            f"HttpClient.{method} is deprecated, use StakeClient.{method} or "
+            "HttpClient.request instead.",
+            DeprecationWarning,
+            stacklevel=3,
+        )
+        data = JsonCodec.dumps(payload) if payload is not None else None
+        body = await HttpClient.request(method, url, data, headers)
+        return JsonCodec.loads(body) if body else None
+
+    @staticmethod
+    async def request(
+        method: str,
+        url: str,
+        data: bytes | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> bytes:
+        """Sends an already encoded body, returning the raw response body."""
         async with aiohttp.ClientSession(
             headers=headers, raise_for_status=True
         ) as session:
-            response = await session.delete(
-                HttpClient.url(url), headers=headers, json=payload
-            )
-            return await response.json()
+            logger.debug("%s %s %s", method.upper(), url, data)
+            async with session.request(
+                method.upper(), HttpClient.url(url), headers=headers, data=data
+            ) as response:
+                return await response.read()
+
+
+class SessionHttpClient:
+    """Handles http calls to the Stake API, reusing the connections of a single
+    session."""
+
+    def __init__(self, session: aiohttp.ClientSession):
+        self.session = session
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        data: bytes | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> bytes:
+        logger.debug("%s %s %s", method.upper(), url, data)
+        async with self.session.request(
+            method.upper(), HttpClient.url(url), headers=headers, data=data
+        ) as response:
+            return await response.read()
 
 
 class InvalidLoginException(Exception):
@@ -118,6 +196,10 @@ class StakeClient:
         self,
         request: Union[CredentialsLoginRequest, SessionTokenLoginRequest, None] = None,
         exchange: Union[constant.NYSEUrl, constant.ASXUrl] = constant.NYSE,
+        pool_settings: Optional[ConnectionPoolSettings] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        codec: Optional[JsonCodec] = None,
     ):
         """
 
@@ -129,14 +211,37 @@ class StakeClient:
             exchange (constant.BaseUrl, optional):
                 the stock exchange to be used.
                 Defaults to constant.NYSE.
+            pool_settings (ConnectionPoolSettings, optional):
+                the limits of the connection pool opened when entering
+                the client's context. Defaults to ConnectionPoolSettings().
+            rate_limiter (RateLimiter, optional):
+                throttles the requests sent to each endpoint group.
+                Defaults to RateLimiter().
+            retry_policy (RetryPolicy, optional):
+                decides which failed requests are retried.
+                Defaults to RetryPolicy().
+            codec (JsonCodec, optional):
+                encodes the request bodies and decodes the responses.
+                Defaults to orjson when installed, to json otherwise.
         """
         self.user: Optional[user.User] = None
+        # the persistent caches of all the sub-clients share this database,
+        # kept in the STAKE_CACHE_DIR directory if set.
+        self.cache_database = CacheDatabase(cache_path("stake.sqlite3"))
         self.set_exchange(exchange=exchange)
         self.headers = Headers()
-        self.http_client = HttpClient
+        self._request_headers: Optional[Tuple[Headers, str, Mapping[str, str]]] = None
+        self.http_client: Union[Type[HttpClient], SessionHttpClient] = HttpClient
+        self.pool_settings = pool_settings or ConnectionPoolSettings()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.codec = codec or default_codec()
+        self._session: Optional[aiohttp.ClientSession] = None
         self._login_request = request or SessionTokenLoginRequest()
 
     def set_exchange(self, exchange: Union[constant.NYSEUrl, constant.ASXUrl]) -> None:
+        if hasattr(self, "market"):
+            self.market.cache.stop_refresher()
         self.exchange = exchange
 
         self.watchlist: watchlist.WatchlistClient = watchlist.WatchlistClient(self)
@@ -177,19 +282,126 @@ class StakeClient:
             self.transactions = transaction.TransactionsClient(self)
             self.statements = statement.StatementClient(self)
 
-    async def get(self, url: str, payload: dict | None = None) -> dict:
+    @property
+    def request_headers(self) -> Mapping[str, str]:
+        """The headers sent with every request.
+
+        They are serialized once into an immutable mapping, and only
+        rebuilt when the session token (or the headers object) changes.
+        """
+        token = self.headers.stake_session_token or ""
+        cached = self._request_headers
+        if cached is None or cached[0] is not self.headers or cached[1] != token:
+            headers = MappingProxyType(self.headers.model_dump(by_alias=True))
+            self._request_headers = cached = (self.headers, token, headers)
+        return cached[2]
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        payload: Any,
+        timeout: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ) -> bytes:
+        """Sends a request, retrying it if it fails because of a transient
+        error and the retry policy deems it safe.
+
+        Args:
+            timeout (float, optional): the timeout of each attempt, in
+                seconds.
+            retry_policy (RetryPolicy, optional): overrides the client's
+                retry policy for this request.
+        """
+        policy = retry_policy or self.retry_policy
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + policy.deadline
+        attempt = 0
+        while True:
+            # waiting for the rate limiter does not count towards the timeout.
+            await self.rate_limiter.acquire(url)
+            try:
+                if timeout is None:
+                    return await self._send(method, url, payload)
+                return await asyncio.wait_for(self._send(method, url, payload), timeout)
+            except Exception as error:
+                if not policy.should_retry(method, url, error):
+                    raise
+                delay = policy.backoff(attempt, error)
+                if delay is None or loop.time() + delay > deadline:
+                    raise
+                logger.debug("Retrying %s %s in %.2fs: %r", method, url, delay, error)
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _send(self, method: str, url: str, payload: Any) -> bytes:
+        """Sends a request once a rate limiter token was acquired, slowing the
+        limiter down if the server starts rejecting requests."""
+        data = None if payload is None else self.codec.dumps(payload)
+        try:
+            response = await self.http_client.request(
+                method, url, data=data, headers=self.request_headers
+            )
+        except aiohttp.ClientResponseError as error:
+            if error.status == 429:
+                self.rate_limiter.on_throttled(url, retry_after(error.headers))
+            raise
+        self.rate_limiter.on_success(url)
+        return response
+
+    def _decode(self, data: bytes) -> Any:
+        return self.codec.loads(data) if data else None
+
+    async def get(
+        self,
+        url: str,
+        payload: dict | None = None,
+        timeout: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ) -> dict:
         """Performs an HTTP get operation.
 
         Args:
             url (str): the current endpoint
             payload (dict): The request's body.
+            timeout (float, optional): the timeout of each attempt, in seconds.
+            retry_policy (RetryPolicy, optional): overrides the client's
+                retry policy.
 
         Returns:
             dict: the json response
         """
 
-        return await self.http_client.get(
-            url, payload=payload, headers=self.headers.model_dump(by_alias=True)
+        return self._decode(
+            await self.get_raw(
+                url, payload=payload, timeout=timeout, retry_policy=retry_policy
+            )
+        )
+
+    async def get_raw(
+        self,
+        url: str,
+        payload: dict | None = None,
+        timeout: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ) -> bytes:
+        """Performs an HTTP get operation, without decoding the response.
+
+        Use this to validate large responses straight from json, e.g. with
+        `Model.model_validate_json` or a `TypeAdapter`.
+
+        Args:
+            url (str): the current endpoint
+            payload (dict): The request's body.
+            timeout (float, optional): the timeout of each attempt, in seconds.
+            retry_policy (RetryPolicy, optional): overrides the client's
+                retry policy.
+
+        Returns:
+            bytes: the json response
+        """
+        return await self._request(
+            "get", url, payload=payload, timeout=timeout, retry_policy=retry_policy
         )
 
     async def post(self, url: str, payload: dict) -> dict:
@@ -203,9 +415,19 @@ class StakeClient:
             dict: the json response
         """
 
-        return await self.http_client.post(
-            url, payload=payload, headers=self.headers.model_dump(by_alias=True)
-        )
+        return self._decode(await self.post_raw(url, payload=payload))
+
+    async def post_raw(self, url: str, payload: dict) -> bytes:
+        """Performs an HTTP post operation, without decoding the response.
+
+        Args:
+            url (str): the current endpoint
+            payload (dict): The request's body.
+
+        Returns:
+            bytes: the json response
+        """
+        return await self._request("post", url, payload=payload)
 
     async def delete(self, url: str, payload: dict | None = None) -> dict:
         """Performs an HTTP delete operation.
@@ -217,9 +439,7 @@ class StakeClient:
         Returns:
             bool: True if the deletion was successful.
         """
-        return await self.http_client.delete(
-            url, headers=self.headers.model_dump(by_alias=True), payload=payload
-        )
+        return self._decode(await self._request("delete", url, payload=payload))
 
     async def login(
         self, login_request: Union[CredentialsLoginRequest, SessionTokenLoginRequest]
@@ -254,9 +474,36 @@ class StakeClient:
         self.user = user.User(**user_data)
         return self.user
 
+    async def open(self) -> None:
+        """Opens the pooled session used by all the subsequent requests."""
+        if self._session is not None and not self._session.closed:
+            return
+        self._session = aiohttp.ClientSession(
+            connector=self.pool_settings.connector(), raise_for_status=True
+        )
+        self.http_client = SessionHttpClient(self._session)
+
+    async def close(self) -> None:
+        """Closes the pooled session, falling back to per-request sessions.
+
+        Also stops the market status refresher, and closes the database
+        of the persistent caches (it is opened again if needed).
+        """
+        self.market.cache.stop_refresher()
+        self.cache_database.close()
+        session, self._session = self._session, None
+        self.http_client = HttpClient
+        if session is not None:
+            await session.close()
+
     async def __aenter__(self):
-        await self.login(self._login_request)
+        await self.open()
+        try:
+            await self.login(self._login_request)
+        except BaseException:
+            await self.close()
+            raise
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        pass
+        await self.close()
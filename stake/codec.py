@@ -0,0 +1,43 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+__all__ = ["JsonCodec", "OrjsonCodec", "default_codec"]
+
+
+class JsonCodec:
+    """Encodes the request bodies and decodes the responses with the standard
+    library's json module."""
+
+    name = "json"
+
+    @staticmethod
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    @staticmethod
+    def loads(data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """A faster codec, available when orjson is installed."""
+
+    name = "orjson"
+
+    @staticmethod
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    @staticmethod
+    def loads(data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+def default_codec() -> JsonCodec:
+    """Returns the fastest codec available."""
+    return OrjsonCodec() if orjson is not None else JsonCodec()
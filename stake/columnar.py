@@ -0,0 +1,127 @@
+"""Columnar exports of the api responses, for numpy and pyarrow.
+
+Both libraries are optional: install them to use the exports.
+"""
+
+from enum import Enum
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Sequence,
+)
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore
+
+try:
+    import pyarrow
+except ImportError:  # pragma: no cover
+    pyarrow = None  # type: ignore
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+    import pyarrow as pa
+
+__all__ = ["Column"]
+
+
+class Column(NamedTuple):
+    """A column of an export.
+
+    Numeric columns are float64, whether the api sends their values as
+    numbers or as strings, and missing values become nan (numpy) or null
+    (arrow). The other columns hold strings.
+    """
+
+    name: str  # the column's name, usually the model's field.
+    key: str  # the key of the value in the json records.
+    numeric: bool = True
+
+
+def _values(records: Sequence[Mapping[str, Any]], key: str) -> List[Any]:
+    return [record.get(key) for record in records]
+
+
+def _scalar(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return str(value)
+
+
+def model_records(
+    models: Iterable[Any], columns: Sequence[Column]
+) -> List[Dict[str, Any]]:
+    """Reads the columns of models into json like records, keyed like the api's
+    json, the column names being the models' fields."""
+    return [
+        {column.key: _scalar(getattr(model, column.name, None)) for column in columns}
+        for model in models
+    ]
+
+
+def to_numpy(
+    records: Sequence[Mapping[str, Any]], columns: Sequence[Column]
+) -> "np.ndarray":
+    """Builds a structured array from json records, one field per column.
+
+    Raises:
+        ImportError: if numpy is not installed.
+    """
+    if numpy is None:
+        raise ImportError("The numpy export requires numpy: pip install numpy")
+
+    array = numpy.empty(
+        len(records),
+        dtype=[
+            (column.name, numpy.float64 if column.numeric else object)
+            for column in columns
+        ],
+    )
+    for column in columns:
+        values = _values(records, column.key)
+        # numpy parses the strings, and turns the missing values into nan.
+        array[column.name] = (
+            numpy.array(values, dtype=numpy.float64) if column.numeric else values
+        )
+    return array
+
+
+def _arrow_floats(values: List[Any]) -> "pa.Array":
+    try:
+        return pyarrow.array(values, pyarrow.float64())
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+        # some of the values are strings: parse them all in a single cast.
+        strings = [None if value is None else str(value) for value in values]
+        return pyarrow.array(strings, pyarrow.string()).cast(pyarrow.float64())
+
+
+def to_arrow(
+    records: Sequence[Mapping[str, Any]], columns: Sequence[Column]
+) -> "pa.Table":
+    """Builds an arrow table from json records, one column per column.
+
+    Raises:
+        ImportError: if pyarrow is not installed.
+    """
+    if pyarrow is None:
+        raise ImportError("The arrow export requires pyarrow: pip install pyarrow")
+
+    return pyarrow.table(
+        {
+            column.name: (
+                _arrow_floats(_values(records, column.key))
+                if column.numeric
+                else pyarrow.array(_values(records, column.key), pyarrow.string())
+            )
+            for column in columns
+        }
+    )
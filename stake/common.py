@@ -1,7 +1,8 @@
+import asyncio
 import weakref
 from enum import Enum
 from functools import partial
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Awaitable, List, TypeVar
 
 import inflection
 
@@ -10,7 +11,9 @@ if TYPE_CHECKING:  # pragma: no cover
 
 camelcase = partial(inflection.camelize, uppercase_first_letter=False)
 
-__all__ = ["SideEnum"]
+T = TypeVar("T")
+
+__all__ = ["FailurePolicy", "SideEnum"]
 
 
 class SideEnum(str, Enum):
@@ -18,7 +21,36 @@ class SideEnum(str, Enum):
     SELL = "S"
 
 
+class FailurePolicy(str, Enum):
+    """What to do when one of many concurrent requests fails."""
+
+    RAISE = "raise"  # fail the whole operation.
+    RETRY = "retry"  # retry the request a few times, then fail.
+    SKIP = "skip"  # leave the failed item out of the results.
+
+
 class BaseClient:
     # flake8: noqa
     def __init__(self, client: "StakeClient"):
         self._client = weakref.proxy(client)
+
+
+async def gather_bounded(
+    *aws: Awaitable[T], limit: int, return_exceptions: bool = False
+) -> List[Any]:
+    """Like asyncio.gather, but awaits at most `limit` awaitables at the same
+    time.
+
+    The results are returned in the same order as the awaitables.
+    """
+    if limit < 1:
+        raise ValueError("'limit' must be at least 1.")
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _bounded(aw: Awaitable[T]) -> T:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(
+        *[_bounded(aw) for aw in aws], return_exceptions=return_exceptions
+    )
@@ -1,11 +1,17 @@
 from enum import Enum
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Union
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from stake import columnar
+from stake.columnar import Column
 from stake.common import BaseClient, SideEnum, camelcase
 
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+    import pyarrow as pa
+
 __all__ = ["EquityCategory"]
 
 
@@ -43,6 +49,33 @@ class EquityPosition(BaseModel):
     model_config = ConfigDict(alias_generator=camelcase)
 
 
+# the columns of the exports of the positions.
+COLUMNS = (
+    Column("symbol", "symbol", numeric=False),
+    Column("instrument_id", "instrumentID", numeric=False),
+    Column("name", "name", numeric=False),
+    Column("category", "category", numeric=False),
+    Column("side", "side", numeric=False),
+    Column("open_qty", "openQty"),
+    Column("available_for_trading_qty", "availableForTradingQty"),
+    Column("average_price", "avgPrice"),
+    Column("market_price", "mktPrice"),
+    Column("market_value", "marketValue"),
+    Column("cost_basis", "costBasis"),
+    Column("last_trade", "lastTrade"),
+    Column("prior_close", "priorClose"),
+    Column("bid_price", "bidPrice"),
+    Column("ask_price", "askPrice"),
+    Column("daily_return_value", "dailyReturnValue"),
+    Column("unrealized_pl", "unrealizedPL"),
+    Column("unrealized_day_pl", "unrealizedDayPL"),
+    Column("unrealized_day_pl_percent", "unrealizedDayPLPercent"),
+    Column("return_on_stock", "returnOnStock"),
+    Column("yearly_return_value", "yearlyReturnValue"),
+    Column("yearly_return_percentage", "yearlyReturnPercentage"),
+)
+
+
 class EquityPositions(BaseModel):
     """Represents the user's portforlio, with the list of the currently
     available equities."""
@@ -52,6 +85,28 @@ class EquityPositions(BaseModel):
     prices_only: bool
     model_config = ConfigDict(alias_generator=camelcase)
 
+    def _json_positions(self) -> List[dict]:
+        """The current positions as json records."""
+        return columnar.model_records(self.equity_positions or [], COLUMNS)
+
+    def to_numpy(self) -> "np.ndarray":
+        """Exports the positions to a numpy structured array, with the fields
+        listed in COLUMNS.
+
+        Raises:
+            ImportError: if numpy is not installed.
+        """
+        return columnar.to_numpy(self._json_positions(), COLUMNS)
+
+    def to_arrow(self) -> "pa.Table":
+        """Exports the positions to an arrow table, with the columns listed in
+        COLUMNS.
+
+        Raises:
+            ImportError: if pyarrow is not installed.
+        """
+        return columnar.to_arrow(self._json_positions(), COLUMNS)
+
 
 class EquitiesClient(BaseClient):
     async def list(self) -> EquityPositions:
@@ -62,3 +117,24 @@ class EquitiesClient(BaseClient):
         """
         data = await self._client.get(self._client.exchange.equity_positions)
         return EquityPositions(**data)
+
+    async def list_columns(
+        self, format: str = "numpy"
+    ) -> Union["np.ndarray", "pa.Table"]:
+        """Fetches the positions straight into columns, without building a
+        model per position.
+
+        Args:
+            format (str): either "numpy", for a structured array, or
+                "arrow", for a table. The columns are listed in COLUMNS.
+
+        Raises:
+            ImportError: if numpy (or pyarrow) is not installed.
+        """
+        if format not in ("numpy", "arrow"):
+            raise ValueError(f"Unknown columnar format '{format}'.")
+        data = await self._client.get(self._client.exchange.equity_positions)
+        records = data.get("equityPositions") or []
+        if format == "arrow":
+            return columnar.to_arrow(records, COLUMNS)
+        return columnar.to_numpy(records, COLUMNS)
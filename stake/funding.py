@@ -1,15 +1,24 @@
 """Your current fundings."""
 
-import asyncio
-import json
+import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from stake.common import BaseClient, camelcase
+from stake.cache import PersistentCache
+from stake.common import BaseClient, FailurePolicy, camelcase, gather_bounded
+from stake.retry import RetryPolicy
 from stake.transaction import TransactionHistoryType, TransactionRecordRequest
 
+if TYPE_CHECKING:  # pragma: no cover
+    from stake.client import StakeClient
+
+logger = logging.getLogger(__name__)
+
+# the details of the fundings with these statuses will not change anymore.
+SETTLED_FUNDING_STATUSES = frozenset({"RECONCILED"})
+
 
 class Funding(BaseModel):
     iof: Optional[str] = None
@@ -65,8 +74,45 @@ class FundsInFlight(BaseModel):
 
 
 class FundingsClient(BaseClient):
-    async def list(self, request: TransactionRecordRequest) -> List[Funding]:
-        payload = json.loads(request.model_dump_json(by_alias=True))
+    def __init__(self, client: "StakeClient"):
+        super().__init__(client)
+        # the details of the settled fundings, by reference. It is persisted
+        # in the STAKE_CACHE_DIR directory, if set.
+        self.details_cache = PersistentCache(
+            client.cache_database, table="funding_details"
+        )
+
+    async def list(
+        self,
+        request: TransactionRecordRequest,
+        concurrency: int = 10,
+        timeout: Optional[float] = 30.0,
+        on_error: FailurePolicy = FailurePolicy.RAISE,
+        retries: int = 2,
+    ) -> List[Funding]:
+        """Returns the fundings executed by the user.
+
+        Every funding needs an extra request to retrieve its details, these
+        are run concurrently.
+
+        Args:
+            request (TransactionRecordRequest): specify the from/to datetimes
+              for the fundings collection.
+            concurrency (int): the maximum number of details requests
+              running at the same time.
+            timeout (float, optional): the timeout of each attempt of a
+              details request, in seconds.
+            on_error (FailurePolicy): what to do when a details request fails.
+              With FailurePolicy.RETRY, the transient failures are retried
+              according to the client's RetryPolicy, otherwise each details
+              request is only attempted once.
+            retries (int): how many times a failed details request is
+              retried at most when using FailurePolicy.RETRY.
+
+        Returns:
+            List[Funding]: the fundings executed in the time frame.
+        """
+        payload = request.model_dump(mode="json", by_alias=True)
         # looks like there is no way to pass filter the transactions here
         data = await self._client.post(
             self._client.exchange.transaction_history, payload=payload
@@ -78,18 +124,51 @@ class FundingsClient(BaseClient):
             if d["referenceType"] == TransactionHistoryType.FUNDING.value
         ]
 
-        details = await asyncio.gather(
+        retry_policy = self._client.retry_policy.with_attempts(
+            retries + 1 if on_error == FailurePolicy.RETRY else 1
+        )
+        details = await gather_bounded(
             *[
-                self._client.get(
-                    self._client.exchange.transaction_details.format(
-                        reference=funding_transaction["reference"],
-                        reference_type=funding_transaction["referenceType"],
-                    ),
+                self._details(
+                    funding_transaction, timeout=timeout, retry_policy=retry_policy
                 )
                 for funding_transaction in funding_transactions
-            ]
+            ],
+            limit=concurrency,
+            return_exceptions=on_error == FailurePolicy.SKIP,
+        )
+        fundings = []
+        for funding_transaction, detail in zip(funding_transactions, details):
+            if isinstance(detail, BaseException):
+                logger.warning(
+                    "Skipping funding %s: %r", funding_transaction["reference"], detail
+                )
+                continue
+            fundings.append(Funding(**detail))
+        return fundings
+
+    async def _details(
+        self,
+        funding_transaction: dict,
+        timeout: Optional[float],
+        retry_policy: RetryPolicy,
+    ) -> dict:
+        """Retrieves the details of a funding transaction, from the cache if it
+        has settled already."""
+        reference = funding_transaction["reference"]
+        detail = self.details_cache.get(reference)
+        if detail is not None:
+            return detail
+
+        url = self._client.exchange.transaction_details.format(
+            reference=reference,
+            reference_type=funding_transaction["referenceType"],
         )
-        return [Funding(**d) for d in details]
+        detail = await self._client.get(url, timeout=timeout, retry_policy=retry_policy)
+
+        if detail.get("status") in SETTLED_FUNDING_STATUSES:
+            self.details_cache.set(reference, detail)
+        return detail
 
     async def in_flight(self) -> List[FundsInFlight]:
         """Returns the funds currently in flight."""
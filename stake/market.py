@@ -1,12 +1,27 @@
 """Checks the market status."""
 
-from typing import Optional
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Awaitable, Callable, Generic, Optional, TypeVar
 
 from pydantic import BaseModel, ConfigDict, Field
 
 from stake.common import BaseClient, camelcase
 
-__all__ = ["MarketStatus"]
+if TYPE_CHECKING:  # pragma: no cover
+    from stake.client import StakeClient
+
+__all__ = ["MarketStatus", "MarketStatusCache"]
+
+logger = logging.getLogger(__name__)
+
+S = TypeVar("S")
+
+# the minimum delay between two background refreshes, in seconds, in case
+# the api keeps returning a transition time in the past.
+MIN_REFRESH_INTERVAL = 1.0
 
 
 class Status(BaseModel):
@@ -21,11 +36,149 @@ class MarketStatus(BaseModel):
     model_config = ConfigDict(alias_generator=camelcase)
 
 
+class MarketStatusCache(Generic[S]):
+    """Keeps the last market status, and serves it until it is known to change
+    or gets older than `max_staleness`.
+
+    Concurrent refreshes share the same request, and an optional background
+    refresher fetches the status again as soon as it expires, so that the
+    callers never wait for it.
+
+    Examples:
+        client.market.cache.start_refresher()
+        await client.market.is_open()  # no request once the status is known.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[S]],
+        changes_at: Callable[[S], Optional[float]] = lambda status: None,
+        max_staleness: float = 60.0,
+        timer: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            fetch (Callable[[], Awaitable[S]]): fetches the current status.
+            changes_at (Callable[[S], Optional[float]]): when the status is
+                due to change (in the `timer`'s seconds), if known.
+            max_staleness (float): how long (in seconds) a status is served
+                at most before being fetched again.
+            timer (Callable[[], float]): the wall clock, since the transition
+                times are timestamps.
+        """
+        self.fetch = fetch
+        self.changes_at = changes_at
+        self.max_staleness = max_staleness
+        self.timer = timer
+        self._status: Optional[S] = None
+        self._expires_at = 0.0
+        self._pending: Optional["asyncio.Future[S]"] = None
+        self._refresher: Optional[asyncio.Task] = None
+
+    @property
+    def expires_at(self) -> Optional[float]:
+        """When the cached status expires, None if nothing is cached."""
+        return self._expires_at if self._status is not None else None
+
+    def set(self, status: S) -> None:
+        """Caches a status, until its transition time or `max_staleness`."""
+        now = self.timer()
+        expires_at = now + self.max_staleness
+        changes_at = self.changes_at(status)
+        if changes_at is not None:
+            expires_at = min(expires_at, changes_at)
+        self._status = status
+        self._expires_at = expires_at
+
+    def invalidate(self) -> None:
+        self._status = None
+
+    async def get(self) -> S:
+        """Returns the cached status, fetching it when missing or expired."""
+        if self._status is not None and self.timer() < self._expires_at:
+            return self._status
+        return await self.refresh()
+
+    async def refresh(self) -> S:
+        """Fetches the status, sharing the request with the concurrent
+        callers."""
+        if self._pending is None:
+            self._pending = asyncio.ensure_future(self._fetch())
+            self._pending.add_done_callback(self._done)
+        # shielded, since the callers share the same request.
+        return await asyncio.shield(self._pending)
+
+    async def _fetch(self) -> S:
+        status = await self.fetch()
+        self.set(status)
+        return status
+
+    def _done(self, future: "asyncio.Future[S]") -> None:
+        self._pending = None
+        if not future.cancelled():
+            # avoids the "exception never retrieved" warning if nobody waits.
+            future.exception()
+
+    def start_refresher(self) -> None:
+        """Refreshes the status in the background whenever it expires, until
+        stop_refresher is called."""
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.ensure_future(self._refresh_forever())
+
+    def stop_refresher(self) -> None:
+        refresher, self._refresher = self._refresher, None
+        if refresher is not None:
+            refresher.cancel()
+
+    async def _refresh_forever(self) -> None:
+        while True:
+            expires_at = self.expires_at
+            if expires_at is not None:
+                delay = max(MIN_REFRESH_INTERVAL, expires_at - self.timer())
+                await asyncio.sleep(delay)
+            try:
+                await self.refresh()
+            except Exception as error:
+                # the callers fetch the status themselves in the meantime.
+                logger.warning("Could not refresh the market status: %r", error)
+                await asyncio.sleep(self.max_staleness)
+
+
+def _changes_at(status: MarketStatus) -> Optional[float]:
+    """The timestamp of the next transition of the market, if known."""
+    change_at = status.status.change_at
+    if not change_at:
+        return None
+    if change_at.isdigit():
+        timestamp = int(change_at)
+        # epoch milliseconds, or seconds.
+        return timestamp / 1000 if timestamp > 1e11 else float(timestamp)
+    try:
+        parsed = datetime.fromisoformat(change_at.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    # without a timezone, the transition time is ambiguous.
+    return parsed.timestamp() if parsed.tzinfo is not None else None
+
+
 class MarketClient(BaseClient):
-    async def get(self) -> MarketStatus:
+    """Retrieves the status of the market, caching it until it changes."""
+
+    def __init__(self, client: "StakeClient"):
+        super().__init__(client)
+        self.cache: MarketStatusCache[MarketStatus] = MarketStatusCache(
+            self._fetch, changes_at=_changes_at
+        )
+
+    async def _fetch(self) -> MarketStatus:
         data = await self._client.get(self._client.exchange.market_status)
         return MarketStatus(**data["response"])
 
+    async def get(self) -> MarketStatus:
+        """Fetches the current status of the market, refreshing the cache."""
+        return await self.cache.refresh()
+
     async def is_open(self) -> bool:
-        status = await self.get()
+        """Whether the market is open, from the cached status when fresh."""
+        status = await self.cache.get()
         return status.status.current == "open"
@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import IntEnum
 from typing import List, Optional, Union
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 from stake.common import BaseClient, SideEnum, camelcase
 
@@ -49,6 +49,9 @@ class CancelOrderRequest(BaseModel):
     order_id: str
 
 
+_orders = TypeAdapter(List[Order])
+
+
 class OrdersClient(BaseClient):
     """This client is in charge of dealing with your pending orders.
 
@@ -62,7 +65,7 @@ class OrdersClient(BaseClient):
             List[Order]: The list of pending orders.
         """
         data = await self._client.get(self._client.exchange.orders)
-        return [Order(**d) for d in data]
+        return _orders.validate_python(data)
 
     async def cancel(self, order: Union[Order, CancelOrderRequest]) -> bool:
         """Cancels a pending order.
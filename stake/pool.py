@@ -0,0 +1,208 @@
+"""Runs many accounts over a single connection pool."""
+
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Union,
+)
+
+import aiohttp
+from pydantic import BaseModel, ConfigDict
+
+from stake import constant
+from stake.client import (
+    ConnectionPoolSettings,
+    CredentialsLoginRequest,
+    SessionHttpClient,
+    SessionTokenLoginRequest,
+    StakeClient,
+)
+from stake.codec import JsonCodec, default_codec
+from stake.common import gather_bounded
+from stake.ratelimit import RateLimiter
+from stake.retry import RetryPolicy
+
+__all__ = ["AccountResult", "StakeClientPool"]
+
+LoginRequest = Union[CredentialsLoginRequest, SessionTokenLoginRequest]
+
+
+class AccountResult(BaseModel):
+    """The outcome of an operation run for one of the accounts of a pool."""
+
+    account: str
+    result: Any = None
+    error: Optional[Exception] = None
+    elapsed: float  # seconds taken by the operation.
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class StakeClientPool:
+    """Holds a StakeClient per account, all of them sending their requests
+    through the same pooled session and the same rate limiter.
+
+    Every client keeps its own session token, so that the accounts can be
+    used concurrently.
+
+    Examples:
+        requests = {
+            "alice": stake.SessionTokenLoginRequest(token=alice_token),
+            "bob": stake.SessionTokenLoginRequest(token=bob_token),
+        }
+        async with stake.StakeClientPool(requests) as pool:
+            failed = [name for name, login in pool.logins.items() if not login.ok]
+            positions = await pool.run(lambda client: client.equities.list())
+            for account, result in positions.items():
+                print(account, result.result if result.ok else result.error)
+    """
+
+    def __init__(
+        self,
+        requests: Mapping[str, LoginRequest],
+        exchange: Union[constant.NYSEUrl, constant.ASXUrl] = constant.NYSE,
+        pool_settings: Optional[ConnectionPoolSettings] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        codec: Optional[JsonCodec] = None,
+        concurrency: int = 10,
+    ):
+        """
+        Args:
+            requests (Mapping[str, LoginRequest]): the authentication of each
+                account, by a name of your choosing.
+            exchange (constant.BaseUrl, optional): the stock exchange used by
+                all the accounts. Defaults to constant.NYSE.
+            pool_settings (ConnectionPoolSettings, optional): the limits of
+                the shared connection pool.
+            rate_limiter (RateLimiter, optional): throttles the requests of
+                all the accounts together. Defaults to RateLimiter().
+            retry_policy (RetryPolicy, optional): decides which failed
+                requests are retried. Defaults to RetryPolicy().
+            codec (JsonCodec, optional): encodes the request bodies and
+                decodes the responses.
+            concurrency (int): how many accounts are logged in, or run an
+                operation, at the same time.
+        """
+        if concurrency < 1:
+            raise ValueError("'concurrency' must be at least 1.")
+        self.pool_settings = pool_settings or ConnectionPoolSettings()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.codec = codec or default_codec()
+        self.concurrency = concurrency
+        self.clients: Dict[str, StakeClient] = {
+            account: StakeClient(
+                request,
+                exchange=exchange,
+                pool_settings=self.pool_settings,
+                rate_limiter=self.rate_limiter,
+                retry_policy=self.retry_policy,
+                codec=self.codec,
+            )
+            for account, request in requests.items()
+        }
+        # the outcome of the last login of each account.
+        self.logins: Dict[str, AccountResult] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def __getitem__(self, account: str) -> StakeClient:
+        return self.clients[account]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.clients)
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    async def open(self) -> None:
+        """Opens the pooled session shared by all the accounts."""
+        if self._session is not None and not self._session.closed:
+            return
+        self._session = aiohttp.ClientSession(
+            connector=self.pool_settings.connector(), raise_for_status=True
+        )
+        http_client = SessionHttpClient(self._session)
+        for client in self.clients.values():
+            client.http_client = http_client
+
+    async def close(self) -> None:
+        """Closes the pooled session, the clients fall back to per-request
+        sessions."""
+        for client in self.clients.values():
+            await client.close()
+        session, self._session = self._session, None
+        if session is not None:
+            await session.close()
+
+    async def run(
+        self,
+        operation: Callable[[StakeClient], Awaitable[Any]],
+        accounts: Optional[Iterable[str]] = None,
+    ) -> Dict[str, AccountResult]:
+        """Runs an operation for each account, at most `concurrency` of them at
+        the same time. A failing account does not stop the others.
+
+        Args:
+            operation (Callable[[StakeClient], Awaitable[Any]]): called with
+                the client of each account.
+            accounts (Iterable[str], optional): the accounts to run the
+                operation for. Defaults to all of them.
+
+        Returns:
+            Dict[str, AccountResult]: the result of each account.
+        """
+        accounts = list(dict.fromkeys(self.clients if accounts is None else accounts))
+
+        async def _run(account: str) -> AccountResult:
+            started = time.perf_counter()
+            try:
+                result = await operation(self.clients[account])
+            except Exception as error:
+                return AccountResult(
+                    account=account,
+                    error=error,
+                    elapsed=time.perf_counter() - started,
+                )
+            return AccountResult(
+                account=account,
+                result=result,
+                elapsed=time.perf_counter() - started,
+            )
+
+        results = await gather_bounded(
+            *[_run(account) for account in accounts], limit=self.concurrency
+        )
+        return dict(zip(accounts, results))
+
+    async def login_all(self) -> Dict[str, AccountResult]:
+        """Logs all the accounts in concurrently.
+
+        Returns:
+            Dict[str, AccountResult]: the user.User of each account, or the
+                InvalidLoginException raised for it.
+        """
+        self.logins = await self.run(lambda client: client.login(client._login_request))
+        return self.logins
+
+    async def __aenter__(self):
+        await self.open()
+        try:
+            await self.login_all()
+        except BaseException:
+            await self.close()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -1,10 +1,25 @@
+import asyncio
+import operator
 import uuid
 from datetime import date, datetime, timedelta
-from typing import TYPE_CHECKING, Any, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
-from pydantic import BaseModel, ConfigDict, PrivateAttr
+from pydantic import BaseModel, ConfigDict, PrivateAttr, TypeAdapter
 from pydantic.fields import Field
 
+from stake.cache import TTLCache
 from stake.common import BaseClient, camelcase
 
 if TYPE_CHECKING:
@@ -12,7 +27,10 @@ if TYPE_CHECKING:
     from stake.ratings import Rating
     from stake.statement import Statement
 
-__all__ = ["ProductSearchByName", "ProductQuote"]
+__all__ = ["ProductSearchByName", "ProductQuote", "QuoteBatcher"]
+
+# the maximum number of symbols sent in a single request to the quotes endpoint.
+MAX_QUOTES_PER_REQUEST = 100
 
 
 class ProductSearchByName(BaseModel):
@@ -51,6 +69,18 @@ class ProductQuote(BaseModel):
     model_config = ConfigDict(alias_generator=camelcase)
 
 
+# the keys of the quote fields, which are always refreshed and never cached.
+QUOTE_FIELDS = frozenset(
+    field.alias or name for name, field in ProductQuote.model_fields.items()
+) - {"symbol"}
+
+_quotes = TypeAdapter(List[ProductQuote])
+
+# a streamed quote is only delivered when one of these fields changes.
+STREAMED_QUOTE_FIELDS = ("bid", "ask", "last_trade", "volume")
+_streamed_values = operator.attrgetter(*STREAMED_QUOTE_FIELDS)
+
+
 class Product(BaseModel):
     id: uuid.UUID
     instrument_type_id: Optional[str] = Field(None, alias="instrumentTypeID")
@@ -120,42 +150,195 @@ class Product(BaseModel):
         )
 
 
+class QuoteBatcher:
+    """Coalesces the single symbol quote requests issued within a short window
+    into a single request to the quotes endpoint.
+
+    Every caller awaits its own quote, while the symbols requested
+    during the same window are sent together and their quotes fanned
+    back out to the callers.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[List[str]], Awaitable[List[ProductQuote]]],
+        window: float = 0.01,
+        max_batch_size: int = MAX_QUOTES_PER_REQUEST,
+    ):
+        """
+        Args:
+            fetch: the coroutine retrieving the quotes for a list of symbols.
+            window (float): how long (in seconds) to wait for more symbols
+                before sending a batch.
+            max_batch_size (int): a batch is sent straight away once it
+                reaches this number of distinct symbols.
+        """
+        self.fetch = fetch
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def quote(self, symbol: str) -> Optional[ProductQuote]:
+        """Returns the quote for the symbol, or None if there is no quote for
+        it."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(symbol, []).append(future)
+
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self.flush)
+
+        return await future
+
+    def flush(self) -> None:
+        """Sends the pending symbols without waiting for the window to
+        expire."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        task = asyncio.ensure_future(self._send(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, pending: Dict[str, List[asyncio.Future]]) -> None:
+        try:
+            quotes = await self.fetch(list(pending))
+        except BaseException as error:
+            # every caller gets the error, even when the batch is cancelled.
+            for futures in pending.values():
+                for future in futures:
+                    if future.done():
+                        continue
+                    if isinstance(error, asyncio.CancelledError):
+                        future.cancel()
+                    else:
+                        future.set_exception(error)
+            if not isinstance(error, Exception):
+                raise
+            return
+
+        if len(pending) == 1 and len(quotes) == 1:
+            # the api may format the symbol differently (e.g. BRK.B as BRK-B).
+            quotes_by_symbol = {symbol.upper(): quotes[0] for symbol in pending}
+        else:
+            quotes_by_symbol = {quote.symbol.upper(): quote for quote in quotes}
+        for symbol, futures in pending.items():
+            quote = quotes_by_symbol.get(symbol.upper())
+            for future in futures:
+                if not future.done():
+                    future.set_result(quote)
+
+
 class ProductsClient(BaseClient):
+    def __init__(self, client: "StakeClient"):
+        super().__init__(client)
+        # single symbol quotes are batched together, tweak the
+        # quote_batcher.window to trade latency for fewer requests.
+        self.quote_batcher = QuoteBatcher(self.quotes)
+        # the product data by symbol, quotes are never cached. The returns
+        # and popularity change during the day, hence the short ttl.
+        self.cache: TTLCache[str, dict] = TTLCache(maxsize=1024, ttl=60.0)
+
     async def quotes(self, symbols: List[str]) -> List[ProductQuote]:
         """Return market quote data for US symbols."""
         data = await self._client.post(
             self._client.exchange.quotes, {"symbols": symbols}
         )
-        return [ProductQuote.model_validate(quote) for quote in data]
+        return _quotes.validate_python(data)
+
+    async def stream_quotes(
+        self,
+        symbols: Iterable[str],
+        interval: float = 1.0,
+        batch_size: int = MAX_QUOTES_PER_REQUEST,
+    ) -> AsyncIterator[ProductQuote]:
+        """Polls the quotes of the symbols every `interval` seconds, and yields
+        the quotes which changed since the previous poll.
+
+        The symbols are polled in as few requests as possible, sent
+        concurrently. Only the bid, ask, last trade and volume of the last
+        quote of each symbol are kept around: the first poll yields every
+        quote, the next ones only the quotes where one of these changed.
+
+        Examples:
+            async for quote in client.products.stream_quotes(["AAPL", "TSLA"]):
+                print(quote.symbol, quote.bid, quote.ask)
+
+        Args:
+            symbols (Iterable[str]): the symbols to poll, nothing is polled
+                (or yielded) without symbols.
+            interval (float): the seconds between the start of two polls.
+            batch_size (int): the maximum number of symbols per request.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return
+        batches = [
+            symbols[i : i + batch_size] for i in range(0, len(symbols), batch_size)
+        ]
+        last: Dict[str, Tuple[Any, ...]] = {}
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            for quotes in await asyncio.gather(*map(self.quotes, batches)):
+                for quote in quotes:
+                    values = _streamed_values(quote)
+                    if last.get(quote.symbol) != values:
+                        last[quote.symbol] = values
+                        yield quote
+            await asyncio.sleep(max(0.0, started + interval - loop.time()))
 
     async def quote(self, symbol: str) -> Optional[ProductQuote]:
-        quotes = await self.quotes([symbol])
-        return quotes[0] if quotes else None
+        """Return the market quote for a single US symbol.
+
+        Concurrent calls are coalesced into a single request by the
+        quote_batcher.
+        """
+        return await self.quote_batcher.quote(symbol)
 
     async def get(self, symbol: str) -> Optional[Product]:
         """Given a symbol it will return the matching product.
 
+        The product data is cached for a minute, while the quote is always
+        refreshed.
+
         Examples:
             tesla_product = self.get("TSLA")
         """
-        data = await self._client.get(
-            self._client.exchange.symbol.format(symbol=symbol)
-        )
+        product_data = self.cache.get(symbol)
+        if product_data is None:
+            data = await self._client.get(
+                self._client.exchange.symbol.format(symbol=symbol)
+            )
 
-        if not data["products"]:
-            return None
+            if not data["products"]:
+                return None
+
+            product_data = {
+                key: value
+                for key, value in data["products"][0].items()
+                if key not in QUOTE_FIELDS
+            }
+            self.cache.set(symbol, product_data)
 
-        product_data = data["products"][0]
         try:
             quote = await self.quote(symbol)
         except Exception:
             quote = None
 
+        product_data = dict(product_data)
         if quote:
-            product_data = {
-                **product_data,
-                **quote.model_dump(by_alias=True, exclude_none=True),
-            }
+            product_data.update(quote.model_dump(by_alias=True, exclude_none=True))
+            if quote.last_trade is not None:
+                product_data["lastTraded"] = quote.last_trade
 
         return Product.model_validate(product_data, context=dict(client=self._client))
 
@@ -0,0 +1,145 @@
+"""Client side throttling of the requests sent to the Stake API."""
+
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+__all__ = ["RateLimiter", "TokenBucket"]
+
+
+def endpoint_group(url: str) -> Tuple[str, str]:
+    """Returns the host and endpoint group of a url, the endpoints sharing the
+    first three segments of their path are rate limited together.
+
+    Examples:
+        endpoint_group("https://api2.prd.hellostake.com/api/asx/orders/1/cancel")
+        -> ("api2.prd.hellostake.com", "api/asx/orders")
+    """
+    parts = urlsplit(url)
+    return parts.netloc, "/".join(parts.path.strip("/").split("/")[:3])
+
+
+def retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Parses the Retry-After header, either in seconds or as a http date."""
+    value = (headers or {}).get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Hands out tokens at a steady rate, allowing bursts up to its capacity.
+
+    The callers waiting for a token are served in order.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            rate (float): the tokens added per second.
+            capacity (float): the maximum number of tokens stored.
+            timer (Callable[[], float]): the clock used to refill the bucket.
+        """
+        if rate <= 0 or capacity < 1:
+            raise ValueError("'rate' must be positive and 'capacity' at least 1.")
+        self.rate = rate
+        self.capacity = capacity
+        self.timer = timer
+        self._tokens = capacity
+        self._updated_at = timer()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> float:
+        now = self.timer()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+        return now
+
+    async def acquire(self) -> None:
+        """Waits until a token is available and takes it."""
+        async with self._lock:
+            while True:
+                now = self._refill()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Stops handing out tokens for a while, emptying the bucket."""
+        self._refill()
+        self._tokens = 0
+        self._paused_until = max(self._paused_until, self.timer() + seconds)
+
+
+class RateLimiter:
+    """Throttles the requests with a token bucket per host and endpoint group.
+
+    The rate of a group is halved every time the server answers with a
+    429, pausing it for the Retry-After time, and slowly recovers
+    afterwards with every successful request.
+    """
+
+    def __init__(
+        self,
+        rate: float = 20.0,
+        burst: float = 20.0,
+        min_rate: float = 0.5,
+        recovery: float = 0.05,
+    ):
+        """
+        Args:
+            rate (float): the maximum requests per second of each group.
+            burst (float): how many requests can be sent at once.
+            min_rate (float): the rate is never lowered below this.
+            recovery (float): how much the rate of a throttled group is
+                increased after each successful request.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.recovery = recovery
+        self.buckets: Dict[Tuple[str, str], TokenBucket] = {}
+
+    def bucket(self, url: str) -> TokenBucket:
+        group = endpoint_group(url)
+        bucket = self.buckets.get(group)
+        if bucket is None:
+            bucket = self.buckets[group] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    async def acquire(self, url: str) -> None:
+        """Waits until a request can be sent to the url."""
+        await self.bucket(url).acquire()
+
+    def on_success(self, url: str) -> None:
+        bucket = self.bucket(url)
+        if bucket.rate < self.rate:
+            bucket.rate = min(self.rate, bucket.rate + self.recovery)
+
+    def on_throttled(self, url: str, retry_after: Optional[float] = None) -> None:
+        """Slows down the group after the server rejected a request with a
+        429."""
+        bucket = self.bucket(url)
+        bucket.rate = max(self.min_rate, bucket.rate / 2)
+        bucket.pause(1 / bucket.rate if retry_after is None else retry_after)
@@ -44,6 +44,9 @@ class Rating(pydantic.BaseModel):
         return None if value == "" else value
 
 
+_ratings = pydantic.TypeAdapter(List[Rating])
+
+
 class RatingsClient(BaseClient):
     """This client is in charge listing the experts' ratings for symbols."""
 
@@ -62,4 +65,4 @@ class RatingsClient(BaseClient):
 
         if data == {"message": "No data returned"}:
             return []
-        return [Rating(**d) for d in data["ratings"]]
+        return _ratings.validate_python(data["ratings"])
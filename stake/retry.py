@@ -0,0 +1,115 @@
+"""Retries of the requests failing because of transient errors."""
+
+import asyncio
+import copy
+import random
+import re
+from typing import Iterable, Optional, Pattern
+
+import aiohttp
+
+from stake import constant
+from stake.ratelimit import retry_after
+
+__all__ = ["RetryPolicy"]
+
+# the http statuses worth retrying, the server might be fine a moment later.
+TRANSIENT_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+# POST endpoints which only read data, so they can be sent more than once.
+IDEMPOTENT_POSTS = (
+    constant.NYSE.account_transactions,
+    constant.NYSE.quotes,
+    constant.NYSE.transaction_history,
+    constant.ASX.instrument_from_symbol,
+    constant.ASX.cancel_order,
+)
+
+
+def _pattern(template: str) -> Pattern[str]:
+    """Compiles a url template into a regex matching the whole formatted url,
+    each placeholder matching exactly one path segment."""
+    parts = re.split(r"\{[^}]*\}", template)
+    return re.compile("[^/]+".join(re.escape(part) for part in parts))
+
+
+class RetryPolicy:
+    """Decides which failed requests are retried, and when.
+
+    GET and DELETE requests are retried on any transient error, as well as
+    the POST requests to the endpoints only reading data. Any other POST
+    request (e.g. an order) is only retried when the error proves it was
+    never processed: the connection could not be established, or the server
+    rejected it with a 429.
+
+    The retries are spaced with an exponential backoff with full jitter, and
+    are never attempted past the total deadline.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.25,
+        max_delay: float = 5.0,
+        deadline: float = 30.0,
+        idempotent_posts: Iterable[str] = IDEMPOTENT_POSTS,
+    ):
+        """
+        Args:
+            max_attempts (int): the total number of attempts, 1 disables the
+                retries.
+            base_delay (float): the backoff of the first retry, in seconds.
+            max_delay (float): the maximum backoff between two attempts.
+            deadline (float): the maximum total time (in seconds) spent on a
+                request, retries included.
+            idempotent_posts (Iterable[str]): the url (templates) of the POST
+                endpoints which are safe to send more than once.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.idempotent_posts = tuple(idempotent_posts)
+        self._idempotent_patterns = [_pattern(url) for url in self.idempotent_posts]
+
+    def with_attempts(self, max_attempts: int) -> "RetryPolicy":
+        """A copy of the policy, making at most `max_attempts` attempts."""
+        policy = copy.copy(self)
+        policy.max_attempts = max_attempts
+        return policy
+
+    @staticmethod
+    def is_transient(error: BaseException) -> bool:
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status in TRANSIENT_STATUSES
+        return isinstance(
+            error, (aiohttp.ClientConnectionError, asyncio.TimeoutError, TimeoutError)
+        )
+
+    @staticmethod
+    def was_not_processed(error: BaseException) -> bool:
+        """True if the error proves that the server did not act on the
+        request."""
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status == 429
+        return isinstance(error, aiohttp.ClientConnectorError)
+
+    def is_idempotent(self, method: str, url: str) -> bool:
+        if method.lower() in ("get", "delete"):
+            return True
+        return any(pattern.fullmatch(url) for pattern in self._idempotent_patterns)
+
+    def backoff(self, attempt: int, error: BaseException) -> Optional[float]:
+        """Returns how long to wait before retrying once the given attempt
+        failed (counting from 0), or None if it should not be retried."""
+        if attempt + 1 >= self.max_attempts:
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        if isinstance(error, aiohttp.ClientResponseError):
+            delay = max(delay, retry_after(error.headers) or 0.0)
+        return delay
+
+    def should_retry(self, method: str, url: str, error: BaseException) -> bool:
+        if not self.is_transient(error):
+            return False
+        return self.is_idempotent(method, url) or self.was_not_processed(error)
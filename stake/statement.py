@@ -37,6 +37,9 @@ class Statement(pydantic.BaseModel):
     model_config = pydantic.ConfigDict(alias_generator=camelcase, populate_by_name=True)
 
 
+_statements = pydantic.TypeAdapter(List[Statement])
+
+
 class StatementClient(BaseClient):
     """This client is in charge listing the experts' statements for symbols."""
 
@@ -55,4 +58,4 @@ class StatementClient(BaseClient):
 
         if data == {"message": "No data returned"}:
             return []
-        return [Statement(**d) for d in data]
+        return _statements.validate_python(data)
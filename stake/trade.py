@@ -1,11 +1,21 @@
+import asyncio
+import logging
 import re
+import time
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
-from stake.common import BaseClient, camelcase
+from stake.common import BaseClient, camelcase, gather_bounded
+from stake.retry import RetryPolicy
+
+if TYPE_CHECKING:  # pragma: no cover
+    from stake.client import StakeClient
+    from stake.product import Product
+
+logger = logging.getLogger(__name__)
 
 failed_transaction_regex = re.compile(r"^[0-9]{4}")
 
@@ -133,20 +143,165 @@ class TradeResponse(BaseModel):
     model_config = ConfigDict(alias_generator=camelcase)
 
 
+TradeRequest = Union[
+    MarketBuyRequest,
+    LimitBuyRequest,
+    StopBuyRequest,
+    LimitSellRequest,
+    StopSellRequest,
+    MarketSellRequest,
+]
+
+
+SELL_REQUESTS = (LimitSellRequest, StopSellRequest, MarketSellRequest)
+
+
+class BatchTradeResult(BaseModel):
+    """The outcome of one of the trades submitted in a batch."""
+
+    request: TradeRequest
+    trade: Optional[TradeResponse] = None
+    error: Optional[Exception] = None
+    elapsed: float  # seconds taken to submit (and confirm) the trade.
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+class TradeConfirmations(BaseClient):
+    """Confirms the submitted trades by finding their matching transaction.
+
+    The transactions may take a while to show up, so they are polled
+    with an exponential backoff. All the trades waiting for a
+    confirmation share the same polling loop, every poll resolving all
+    the trades it can. A poll failing with a transient error is retried
+    until the deadline of the trades.
+    """
+
+    def __init__(
+        self,
+        client: "StakeClient",
+        timeout: float = 10.0,
+        backoff: float = 0.5,
+        max_delay: float = 4.0,
+    ):
+        """
+        Args:
+            client (StakeClient): the client used to fetch the transactions.
+            timeout (float): how long (in seconds) to wait for a transaction
+                to show up before failing.
+            backoff (float): the delay before the second poll, it doubles
+                after every poll.
+            max_delay (float): the maximum delay between two polls.
+        """
+        super().__init__(client)
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._deadlines: Dict[str, float] = {}
+        self._poller: Optional[asyncio.Task] = None
+
+    async def confirm(self, trade: TradeResponse) -> None:
+        """Waits for the transaction matching the trade.
+
+        Raises:
+            RuntimeError if the trade was not successful, or if no matching
+            transaction showed up in time.
+        """
+        loop = asyncio.get_running_loop()
+        future = self._pending.get(trade.dw_order_id)
+        if future is None:
+            future = loop.create_future()
+            self._pending[trade.dw_order_id] = future
+            self._deadlines[trade.dw_order_id] = loop.time() + self.timeout
+
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.ensure_future(self._poll())
+
+        # shielded, since several trades can wait for the same order.
+        await asyncio.shield(future)
+
+    async def _poll(self) -> None:
+        loop = asyncio.get_running_loop()
+        delay = 0.0
+        try:
+            while self._pending:
+                await asyncio.sleep(delay)
+                delay = min(self.max_delay, max(self.backoff, delay * 2))
+                try:
+                    data = await self._client.get(self._client.exchange.transactions)
+                except Exception as poll_error:
+                    if not RetryPolicy.is_transient(poll_error):
+                        raise
+                    # polled again after the backoff, until the deadlines.
+                    logger.warning("Could not poll the transactions: %r", poll_error)
+                    failure = poll_error
+                else:
+                    self._resolve(data.get("transactions") if data else None)
+                    if data:
+                        failure = RuntimeError("Could not find a matching transaction.")
+                    else:
+                        failure = RuntimeError(
+                            "The trade did not succeed (Reason: no transaction found)."
+                        )
+
+                now = loop.time()
+                for order_id, deadline in list(self._deadlines.items()):
+                    if deadline <= now:
+                        self._settle(order_id, failure)
+        except Exception as error:
+            # the error is only delivered to the trades waiting for it.
+            for order_id in list(self._pending):
+                self._settle(order_id, error)
+        except BaseException as error:
+            for order_id in list(self._pending):
+                self._settle(order_id, error)
+            raise
+
+    def _resolve(self, transactions: Optional[list]) -> None:
+        """Resolves the pending trades matching the polled transactions."""
+        by_order_id: Dict[str, dict] = {}
+        for transaction in transactions or []:
+            by_order_id.setdefault(transaction["orderId"], transaction)
+
+        for order_id in list(self._pending):
+            transaction = by_order_id.get(order_id)
+            if transaction is None:
+                continue
+            reason = transaction.get("updatedReason") or ""
+            if re.search(failed_transaction_regex, reason):
+                self._settle(
+                    order_id,
+                    RuntimeError(f"The trade did not succeed (Reason: {reason}"),
+                )
+            else:
+                self._settle(order_id)
+
+    def _settle(self, order_id: str, error: Optional[BaseException] = None) -> None:
+        future = self._pending.pop(order_id)
+        self._deadlines.pop(order_id, None)
+        if future.done():
+            return
+        if error is None:
+            future.set_result(None)
+        elif isinstance(error, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(error)
+            # avoids the "exception never retrieved" warning if nobody waits.
+            future.exception()
+
+
 class TradesClient(BaseClient):
     """This client is used to buy/sell equities."""
 
+    def __init__(self, client: "StakeClient"):
+        super().__init__(client)
+        self.confirmations = TradeConfirmations(client)
+
     async def _trade(
         self,
         url: str,
-        request: Union[
-            MarketBuyRequest,
-            LimitBuyRequest,
-            StopBuyRequest,
-            LimitSellRequest,
-            StopSellRequest,
-            MarketSellRequest,
-        ],
+        request: TradeRequest,
         check_success: bool = True,
     ) -> TradeResponse:
         """A generic function used to submit a trade, either buy or sell.
@@ -165,21 +320,27 @@ class TradesClient(BaseClient):
         Raises:
             RuntimeError
         """
-        request_dict = request.model_dump(by_alias=True)
-        product = await self._client.products.get(request_dict.pop("symbol"))
+        product = await self._client.products.get(request.symbol)
         assert product
-
-        request_dict["orderType"] = request_dict["orderType"].value
-        request_dict["userId"] = str(self._client.user.id)
-        request_dict["itemId"] = str(product.id)
-        data = await self._client.post(url, request_dict)
-        trade = TradeResponse(**data[0])
+        trade = await self._submit(url, request, product)
 
         if check_success:
             await self._verify_successful_trade(trade)
 
         return trade
 
+    async def _submit(
+        self, url: str, request: TradeRequest, product: "Product"
+    ) -> TradeResponse:
+        """Posts the trade for an already retrieved product."""
+        request_dict = request.model_dump(by_alias=True)
+        request_dict.pop("symbol")
+        request_dict["orderType"] = request_dict["orderType"].value
+        request_dict["userId"] = str(self._client.user.id)
+        request_dict["itemId"] = str(product.id)
+        data = await self._client.post(url, request_dict)
+        return TradeResponse(**data[0])
+
     async def _verify_successful_trade(self, trade: TradeResponse) -> None:
         """We check the status of the trade by trying to find the matching
         transaction and inspecting its properties. This should not be needed
@@ -192,26 +353,7 @@ class TradesClient(BaseClient):
         Raises:
             RuntimeError if the trade was not successful.
         """
-
-        transactions = await self._client.get(self._client.exchange.transactions)
-
-        if not transactions:
-            raise RuntimeError(
-                "The trade did not succeed (Reason: no transaction found)."
-            )
-
-        # wait for the transaction to be available
-        for transaction in transactions["transactions"]:
-            if transaction["orderId"] == trade.dw_order_id:
-                if re.search(failed_transaction_regex, transaction["updatedReason"]):
-                    raise RuntimeError(
-                        "The trade did not succeed "
-                        f"(Reason: {transaction['updatedReason']}"
-                    )
-                else:
-                    return
-
-        raise RuntimeError("Could not find a matching transaction.")
+        await self.confirmations.confirm(trade)
 
     async def buy(
         self, request: Union[MarketBuyRequest, LimitBuyRequest, StopBuyRequest]
@@ -236,3 +378,88 @@ class TradesClient(BaseClient):
             the TradeResponse object
         """
         return await self._trade(self._client.exchange.sell_orders, request)
+
+    async def submit_batch(
+        self,
+        requests: Sequence[TradeRequest],
+        concurrency: int = 5,
+        check_success: bool = True,
+    ) -> List[BatchTradeResult]:
+        """Submits a basket of buy/sell trades at once.
+
+        Every symbol is only looked up once, the trades are then submitted
+        concurrently and confirmed by a single, shared, transactions poll.
+        A failing trade does not stop the others.
+
+        Args:
+            requests: the buy/sell requests, the sell ones are sent to the
+                sell orders endpoint.
+            concurrency: the maximum number of trades submitted at the same
+                time.
+            check_success: whether to confirm the trades, see _trade.
+
+        Returns:
+            List[BatchTradeResult]: the result of each request, in order.
+        """
+        symbols = list(dict.fromkeys(request.symbol for request in requests))
+        lookups = await asyncio.gather(
+            *[self._client.products.get(symbol) for symbol in symbols],
+            return_exceptions=True,
+        )
+        products: Dict[str, Union[Optional["Product"], BaseException]] = dict(
+            zip(symbols, lookups)
+        )
+
+        async def _submit(
+            request: TradeRequest,
+        ) -> Tuple[float, Union[TradeResponse, Exception]]:
+            started = time.perf_counter()
+            url = (
+                self._client.exchange.sell_orders
+                if isinstance(request, SELL_REQUESTS)
+                else self._client.exchange.quick_buy
+            )
+            try:
+                product = products[request.symbol]
+                if isinstance(product, BaseException):
+                    raise product
+                if product is None:
+                    raise ValueError(f"Could not find the symbol {request.symbol}.")
+                return started, await self._submit(url, request, product)
+            except Exception as error:
+                return started, error
+
+        submitted = await gather_bounded(
+            *[_submit(request) for request in requests], limit=concurrency
+        )
+
+        async def _confirm(
+            request: TradeRequest,
+            started: float,
+            trade: Union[TradeResponse, Exception],
+        ) -> BatchTradeResult:
+            if isinstance(trade, Exception):
+                return BatchTradeResult(
+                    request=request,
+                    error=trade,
+                    elapsed=time.perf_counter() - started,
+                )
+            error = None
+            if check_success:
+                try:
+                    await self._verify_successful_trade(trade)
+                except Exception as confirmation_error:
+                    error = confirmation_error
+            return BatchTradeResult(
+                request=request,
+                trade=trade,
+                error=error,
+                elapsed=time.perf_counter() - started,
+            )
+
+        return await asyncio.gather(
+            *[
+                _confirm(request, started, trade)
+                for request, (started, trade) in zip(requests, submitted)
+            ]
+        )
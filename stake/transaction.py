@@ -1,15 +1,19 @@
 import enum
-import json
+import re
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
 from pydantic.types import UUID, UUID4
 
+from stake.cache import cache_path, connect
 from stake.common import BaseClient, camelcase
 
-__all__ = ["TransactionRecordRequest"]
+__all__ = ["TransactionRecordRequest", "TransactionStore"]
+
+_VALID_ACCOUNT = re.compile(r"[A-Za-z0-9._-]+")
 
 
 class TransactionRecordEnumDirection(str, Enum):
@@ -67,6 +71,15 @@ class Transaction(BaseModel):
     wlp_fin_tran_type_id: Optional[UUID] = Field(None, alias="wlpFinTranTypeID")
     model_config = ConfigDict(alias_generator=camelcase)
 
+    @model_validator(mode="after")
+    def _symbol_from_instrument(self) -> "Transaction":
+        if self.instrument:
+            self.symbol = self.instrument.symbol
+        return self
+
+
+_transactions = TypeAdapter(List[Transaction])
+
 
 class TransactionHistoryType(str, enum.Enum):
     BUY = "Buy"
@@ -77,6 +90,139 @@ class TransactionHistoryType(str, enum.Enum):
     SELL = "Sell"
 
 
+def _sortable(when: datetime) -> str:
+    """Formats a datetime so that it sorts chronologically as text."""
+    if when.tzinfo is not None:
+        when = when.astimezone(timezone.utc).replace(tzinfo=None)
+    return when.isoformat()
+
+
+class TransactionStore:
+    """An append-only local copy of the user's transactions, persisted in a
+    SQLite database.
+
+    Use one store per account, see TransactionsClient.sync.
+
+    Examples:
+        store = TransactionStore(account=str(client.user.id))
+        await client.transactions.sync(store)
+    """
+
+    def __init__(
+        self, path: Union[str, Path, None] = None, account: Optional[str] = None
+    ):
+        """
+        Args:
+            path (Union[str, Path], optional): the SQLite database file.
+            account (str, optional): the id of the account, used to name the
+                account's own database file in the STAKE_CACHE_DIR directory
+                (or to keep it in memory) when no path is given.
+
+        Raises:
+            ValueError: if neither a path nor a valid account id is given.
+        """
+        if path is None:
+            if account is None or not _VALID_ACCOUNT.fullmatch(account):
+                raise ValueError(
+                    "The transactions of each account are stored apart: "
+                    f"pass a path or a valid account id, not {account!r}."
+                )
+            path = cache_path(f"nyse-transactions-{account}.sqlite3")
+        self._connection = connect(path)
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS transactions (
+                fin_tran_id TEXT PRIMARY KEY,
+                tran_when TEXT NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS transactions_tran_when
+                ON transactions (tran_when);
+            CREATE TABLE IF NOT EXISTS sync_state (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """
+        )
+
+    def append(self, transactions: Iterable["Transaction"]) -> List["Transaction"]:
+        """Stores the transactions which are not in the store yet.
+
+        Returns:
+            List[Transaction]: the newly stored transactions.
+        """
+        added = []
+        for transaction in transactions:
+            cursor = self._connection.execute(
+                "INSERT OR IGNORE INTO transactions (fin_tran_id, tran_when, data) "
+                "VALUES (?, ?, ?)",
+                (
+                    transaction.fin_tran_id,
+                    _sortable(transaction.tran_when),
+                    transaction.model_dump_json(by_alias=True),
+                ),
+            )
+            if cursor.rowcount:
+                added.append(transaction)
+        return added
+
+    def _edge(self, order: str) -> Optional[Tuple[datetime, str]]:
+        row = self._connection.execute(
+            "SELECT data, fin_tran_id FROM transactions "
+            f"ORDER BY tran_when {order}, fin_tran_id {order} LIMIT 1"
+        ).fetchone()
+        if row is None:
+            return None
+        return Transaction.model_validate_json(row[0]).tran_when, row[1]
+
+    def latest(self) -> Optional[Tuple[datetime, str]]:
+        """Returns the tran_when and fin_tran_id of the newest transaction
+        stored, if any."""
+        return self._edge("DESC")
+
+    def earliest(self) -> Optional[Tuple[datetime, str]]:
+        """Returns the tran_when and fin_tran_id of the oldest transaction
+        stored, if any."""
+        return self._edge("ASC")
+
+    @property
+    def filled(self) -> bool:
+        """Whether the first sync of the store went through to the end."""
+        row = self._connection.execute(
+            "SELECT value FROM sync_state WHERE key = 'filled'"
+        ).fetchone()
+        return row is not None
+
+    def mark_filled(self) -> None:
+        self._connection.execute(
+            "INSERT OR REPLACE INTO sync_state (key, value) VALUES ('filled', '1')"
+        )
+
+    def transactions(
+        self, from_: Optional[datetime] = None, to: Optional[datetime] = None
+    ) -> List["Transaction"]:
+        """Returns the stored transactions, oldest first, optionally within a
+        time frame."""
+        query = "SELECT data FROM transactions WHERE tran_when >= ? AND tran_when <= ?"
+        rows = self._connection.execute(
+            query + " ORDER BY tran_when, fin_tran_id",
+            (
+                _sortable(from_) if from_ else "",
+                _sortable(to) if to else "\uffff",
+            ),
+        )
+        return [Transaction.model_validate_json(data) for (data,) in rows]
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __len__(self) -> int:
+        (count,) = self._connection.execute(
+            "SELECT COUNT(*) FROM transactions"
+        ).fetchone()
+        return count
+
+
 class TransactionsClient(BaseClient):
     async def list(self, request: TransactionRecordRequest) -> List[Transaction]:
         """Returns the transactions executed by the user.
@@ -88,14 +234,83 @@ class TransactionsClient(BaseClient):
         Returns:
             List[Transaction]: the transactions executed in the time frame.
         """
-        payload = json.loads(request.model_dump_json(by_alias=True))
+        payload = request.model_dump(mode="json", by_alias=True)
 
-        data = await self._client.post(
+        # the history can be large, validate it straight from the json.
+        data = await self._client.post_raw(
             self._client.exchange.account_transactions, payload=payload
         )
-        transactions = []
-        for d in data:
-            if d.get("instrument"):
-                d["symbol"] = d.get("instrument")["symbol"]
-            transactions.append(Transaction(**d))
-        return transactions
+        return _transactions.validate_json(data)
+
+    async def sync(
+        self,
+        store: TransactionStore,
+        request: Optional[TransactionRecordRequest] = None,
+    ) -> List[Transaction]:
+        """Appends to the store the transactions it has not seen yet.
+
+        Only the transactions newer than the latest stored one are
+        requested, moving the offset forward one page at a time. An empty
+        store is filled with the time frame of the request, paging in the
+        request's direction. If that first fill is interrupted, the next
+        sync resumes it from the oldest transaction stored.
+
+        Args:
+            store (TransactionStore): the local copy of the transactions.
+            request (TransactionRecordRequest, optional): the time frame and
+                page size used when the store is empty.
+
+        Returns:
+            List[Transaction]: the transactions added to the store.
+        """
+        request = request or TransactionRecordRequest()
+        added: List[Transaction] = []
+        if (
+            not store.filled
+            and request.direction == TransactionRecordEnumDirection.prev
+        ):
+            # the first fill pages back in time: resume it from the oldest
+            # transaction stored, if it was interrupted.
+            earliest = store.earliest()
+            fill = request
+            if earliest is not None:
+                fill = request.model_copy(update={"offset": earliest[0]})
+            added += await self._fetch_pages(store, fill)
+            store.mark_filled()
+            if earliest is None:
+                return added
+
+        latest = store.latest()
+        if latest:
+            request = request.model_copy(
+                update={
+                    "from_": latest[0],
+                    "offset": latest[0],
+                    "direction": TransactionRecordEnumDirection.next_,
+                }
+            )
+        added += await self._fetch_pages(store, request)
+        store.mark_filled()
+        return added
+
+    async def _fetch_pages(
+        self, store: TransactionStore, request: TransactionRecordRequest
+    ) -> List[Transaction]:
+        """Appends the pages of transactions to the store, moving the offset
+        one page at a time in the direction of the request."""
+        added: List[Transaction] = []
+        while True:
+            page = await self.list(request)
+            added += store.append(page)
+            if len(page) < request.limit:
+                return added
+
+            # move the offset past the page, in the direction of the request.
+            if request.direction == TransactionRecordEnumDirection.prev:
+                offset = min(transaction.tran_when for transaction in page)
+            else:
+                offset = max(transaction.tran_when for transaction in page)
+            if offset == request.offset:
+                # no progress can be made, the page is full of the same instant.
+                return added
+            request = request.model_copy(update={"offset": offset})
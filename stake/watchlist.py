@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import List, Optional, Union
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 from stake.common import BaseClient, camelcase
 from stake.product import Instrument, Product
@@ -72,6 +72,9 @@ class WatchlistProduct(BaseModel):
     model_config = ConfigDict(alias_generator=camelcase)
 
 
+_watchlists = TypeAdapter(List[Watchlist])
+
+
 class WatchlistClient(BaseClient):
     async def _modify_watchlist(
         self, request: Union[AddToWatchlistRequest, RemoveFromWatchlistRequest]
@@ -117,7 +120,7 @@ class WatchlistClient(BaseClient):
         """
 
         response = await self._client.get(self._client.exchange.watchlists)
-        return [Watchlist(**watchlist) for watchlist in response["watchlists"]]
+        return _watchlists.validate_python(response["watchlists"])
 
     async def create_watchlist(
         self, request: CreateWatchlistRequest
@@ -11,6 +11,27 @@ from tests.vcr_scrubber import redact_sensitive_data, redact_sensitive_request
 load_dotenv()
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark", action="store_true", help="run the benchmarks as well."
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: a timing comparison, only run with --benchmark."
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest_asyncio.fixture
 async def tracing_client(request, mocker):
     async with StakeClient() as client:
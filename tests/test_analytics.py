@@ -0,0 +1,129 @@
+import random
+from collections import defaultdict
+
+import pytest
+
+from stake import equity
+
+numpy = pytest.importorskip("numpy")
+
+from stake.analytics import Portfolio  # noqa: E402
+
+
+def _position(symbol: str, category, rng: random.Random) -> dict:
+    open_qty = rng.uniform(1, 100)
+    price = rng.uniform(1, 500)
+    cost = open_qty * rng.uniform(1, 500)
+    return {
+        "symbol": symbol,
+        "encodedName": symbol.lower(),
+        "instrumentID": "1cf93550-8eb4-4c32-a229-826cf8c1be59",
+        "category": category,
+        "side": "B",
+        "openQty": str(open_qty),
+        "availableForTradingQty": open_qty,
+        "avgPrice": cost / open_qty,
+        "mktPrice": str(price),
+        "marketValue": str(open_qty * price),
+        "costBasis": cost,
+        "unrealizedPL": open_qty * price - cost,
+        "unrealizedDayPL": 1.0,
+        "unrealizedDayPLPercent": 1.0,
+        "dailyReturnValue": rng.uniform(-50, 50),
+        "lastTrade": price,
+        "priorClose": price,
+        "name": symbol,
+        "period": "YEAR RETURN",
+        "urlImage": "https://drivewealth.imgix.net/symbols/aapl.png",
+    }
+
+
+@pytest.fixture
+def equities() -> equity.EquityPositions:
+    rng = random.Random(42)
+    categories = ["ETF", "Stock", None]
+    positions = [
+        _position(f"S{i}", categories[i % len(categories)], rng) for i in range(50)
+    ]
+    return equity.EquityPositions(
+        equityPositions=positions, equityValue=0, pricesOnly=False
+    )
+
+
+def test_weights_and_contributions(equities: equity.EquityPositions):
+    portfolio = Portfolio(equities)
+    positions = equities.equity_positions
+    total = sum(p.market_value for p in positions)
+    previous = total - sum(p.daily_return_value for p in positions)
+
+    assert portfolio.total_value == pytest.approx(total)
+    assert portfolio.weights() == pytest.approx(
+        [p.market_value / total for p in positions]
+    )
+    assert portfolio.weights().sum() == pytest.approx(1)
+    assert portfolio.contributions() == pytest.approx(
+        [p.daily_return_value / previous for p in positions]
+    )
+
+    # a narrowed portfolio only weighs the positions kept.
+    subset = equities.model_copy(update={"equity_positions": positions[:10]})
+    subset_total = sum(p.market_value for p in positions[:10])
+    assert Portfolio(subset).weights() == pytest.approx(
+        [p.market_value / subset_total for p in positions[:10]]
+    )
+    assert Portfolio(subset.to_numpy()).total_value == pytest.approx(subset_total)
+
+
+def test_aggregate(equities: equity.EquityPositions):
+    expected: dict = defaultdict(lambda: defaultdict(float))
+    total = 0.0
+    for p in equities.equity_positions:
+        group = expected[p.category.value if p.category else None]
+        group["market_value"] += p.market_value
+        group["cost_basis"] += p.cost_basis
+        group["unrealized_pl"] += p.unrealized_pl
+        group["daily_return_value"] += p.daily_return_value
+        total += p.market_value
+    for group in expected.values():
+        group["weight"] = group["market_value"] / total
+
+    aggregated = Portfolio(equities).aggregate()
+    assert set(aggregated) == {"ETF", "Stock", None}
+    for key, group in expected.items():
+        assert aggregated[key] == pytest.approx(dict(group))
+
+    by_symbol = Portfolio(equities).aggregate(by="symbol")
+    assert len(by_symbol) == len(equities.equity_positions)
+    with pytest.raises(ValueError):
+        Portfolio(equities).aggregate(by="sector")
+
+
+def test_shocked_valuations(equities: equity.EquityPositions):
+    portfolio = Portfolio(equities)
+    positions = equities.equity_positions
+
+    shocks = {"ETF": -0.1, "Stock": -0.25}
+    expected_values = [
+        p.market_value * (1 + (shocks.get(p.category.value, 0) if p.category else 0))
+        for p in positions
+    ]
+    assert portfolio.shocked_values(shocks) == pytest.approx(expected_values)
+    assert portfolio.shocked_pnl(shocks) == pytest.approx(
+        sum(expected_values) - sum(p.market_value for p in positions)
+    )
+
+    assert portfolio.shocked_pnl(-0.5) == pytest.approx(-portfolio.total_value / 2)
+    assert portfolio.shocked_pnl({"S0": 1.0}, by="symbol") == pytest.approx(
+        positions[0].market_value
+    )
+
+    # many scenarios at once, one row each.
+    scenarios = numpy.random.default_rng(0).normal(0, 0.1, (100, len(positions)))
+    expected_pnl = [
+        sum(p.market_value * shock for p, shock in zip(positions, scenario))
+        for scenario in scenarios.tolist()
+    ]
+    assert portfolio.shocked_values(scenarios).shape == scenarios.shape
+    assert portfolio.shocked_pnl(scenarios) == pytest.approx(expected_pnl)
+    with pytest.raises(ValueError):
+        portfolio.shocked_pnl(scenarios[:, 1:])
@@ -0,0 +1,144 @@
+import math
+import random
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+from stake.asx.product import CourseOfSale
+from stake.asx.ticks import TickStore
+
+pytest.importorskip("numpy")
+
+from stake.asx.bars import Bar, BarBuilder  # noqa: E402
+
+INTERVAL = 60_000
+
+
+def _sales(count: int, seed: int = 0) -> List[CourseOfSale]:
+    rng = random.Random(seed)
+    return [
+        CourseOfSale(
+            id=str(i),
+            price=round(rng.uniform(10, 12), 2),
+            volume=rng.randint(1, 1000),
+            tradeTimeMillis=rng.randint(0, 10 * INTERVAL),
+        )
+        for i in range(count)
+    ]
+
+
+def _time(sale: CourseOfSale) -> int:
+    assert sale.trade_time_millis is not None
+    return sale.trade_time_millis
+
+
+def _reference(sales: List[CourseOfSale], cancelled=()) -> Dict[int, Bar]:
+    """Builds the bars one trade at a time."""
+    trades: Dict[int, List[Tuple[float, int]]] = defaultdict(list)
+    for sale in sorted(sales, key=_time):
+        if sale.id not in cancelled:
+            assert sale.price is not None and sale.volume is not None
+            trades[_time(sale) // INTERVAL * INTERVAL].append((sale.price, sale.volume))
+    bars = {}
+    for start, bucket in trades.items():
+        prices = [price for price, _ in bucket]
+        volume = sum(volume for _, volume in bucket)
+        value = sum(price * volume for price, volume in bucket)
+        bars[start] = Bar(
+            start,
+            prices[0],
+            max(prices),
+            min(prices),
+            prices[-1],
+            volume,
+            value,
+            value / volume,
+            len(bucket),
+        )
+    return bars
+
+
+def _assert_bars(bars: List[Bar], expected: Dict[int, Bar]):
+    assert [bar.start for bar in bars] == sorted(expected)
+    for bar in bars:
+        assert bar == pytest.approx(expected[bar.start])
+
+
+def test_bars_match_reference():
+    sales = _sales(1000)
+    builder = BarBuilder(INTERVAL)
+    builder.update(sales)
+    _assert_bars(builder.bars(), _reference(sales))
+    assert builder.bars(start=INTERVAL, end=3 * INTERVAL) == [
+        bar for bar in builder.bars() if INTERVAL <= bar.start < 3 * INTERVAL
+    ]
+
+
+def test_bars_are_updated_incrementally():
+    sales = sorted(_sales(1000, seed=1), key=_time)
+    builder = BarBuilder(INTERVAL)
+    seen: List[CourseOfSale] = []
+    for i in range(0, len(sales), 50):
+        # the api returns the latest prints, including some seen before.
+        batch = sales[max(0, i - 20) : i + 50]
+        changed = builder.update(reversed(batch))
+        seen += sales[i : i + 50]
+        assert changed
+        assert changed[-1] == builder.bars()[-1]
+        _assert_bars(builder.bars(), _reference(seen))
+
+    # a late print only rebuilds its bar onward.
+    late = CourseOfSale(id="late", price=1.0, volume=1, tradeTimeMillis=5)
+    changed = builder.update([late])
+    assert [bar.start for bar in changed] == [0]
+    _assert_bars(builder.bars(), _reference(seen + [late]))
+
+
+def test_incomplete_prints_are_skipped():
+    sales = [
+        CourseOfSale(id="1", price=10.0, volume=10, tradeTimeMillis=1),
+        CourseOfSale(id="2", volume=10, tradeTimeMillis=2),
+        CourseOfSale(id="3", price=11.0, tradeTimeMillis=3),
+        CourseOfSale(id="4", price=12.0, volume=10),
+    ]
+    builder = BarBuilder(INTERVAL)
+    builder.update(sales)
+    _assert_bars(builder.bars(), _reference(sales[:1]))
+
+
+def test_cancelled_prints_are_removed():
+    sales = [
+        CourseOfSale(id="1", price=10.0, volume=10, tradeTimeMillis=1),
+        CourseOfSale(id="2", price=11.0, volume=10, tradeTimeMillis=2),
+        CourseOfSale(id="3", price=12.0, volume=10, tradeTimeMillis=INTERVAL),
+    ]
+    builder = BarBuilder(INTERVAL)
+    builder.update(sales)
+    assert builder.bars()[0].high == 11.0
+
+    def _cancel(sale: CourseOfSale, when: Optional[int] = 5) -> CourseOfSale:
+        return sale.model_copy(update={"cancelled_time_millis": when})
+
+    changed = builder.update([_cancel(sales[1])])
+    assert len(changed) == 1
+    _assert_bars(builder.bars(), _reference(sales, cancelled={"2"}))
+    # the same cancellation changes nothing.
+    assert not builder.update([_cancel(sales[1])])
+
+    (changed_bar,) = builder.update([_cancel(sales[2])])
+    assert changed_bar.start == INTERVAL
+    assert changed_bar.trades == changed_bar.volume == 0
+    assert math.isnan(changed_bar.close)
+    assert len(builder) == 1
+
+
+def test_bars_from_tick_store():
+    sales = sorted(_sales(500, seed=2), key=_time)
+    store = TickStore()
+    store.append("ORG", sales)
+
+    builder = BarBuilder(INTERVAL)
+    builder.add_ticks(store.ticks("ORG", end=5 * INTERVAL))
+    builder.add_ticks(store.ticks("ORG", start=5 * INTERVAL))
+    _assert_bars(builder.bars(), _reference(sales))
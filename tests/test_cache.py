@@ -0,0 +1,83 @@
+import pytest
+
+from stake.cache import CacheDatabase, PersistentCache, TTLCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expires_entries():
+    timer = FakeTimer()
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=10, timer=timer)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=100)
+
+    assert cache.get("a") == 1
+    timer.now = 11
+    assert cache.get("a") is None
+    assert "a" not in cache
+    assert cache.get("b") == 2
+
+    assert cache.stats.hits == 2
+    assert cache.stats.misses == 1
+    assert cache.stats.expirations == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache: TTLCache[str, int] = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+    assert len(cache) == 2
+
+    with pytest.raises(ValueError):
+        TTLCache(maxsize=0)
+
+
+def test_persistent_cache_is_shared_across_connections(tmp_path):
+    path = tmp_path / "stake" / "cache.sqlite3"
+    cache = PersistentCache(path, table="instruments")
+    cache.set("COL", "1cf93550-8eb4-4c32-a229-826cf8c1be59")
+    cache.set("ANZ", {"id": 1})
+
+    other = PersistentCache(path, table="instruments")
+    assert other.get("COL") == "1cf93550-8eb4-4c32-a229-826cf8c1be59"
+    assert other.get("ANZ") == {"id": 1}
+    assert "WDS" not in other
+    assert len(other) == 2
+
+    other.invalidate("ANZ")
+    assert cache.get("ANZ") is None
+
+    with pytest.raises(ValueError):
+        PersistentCache(path, table="instruments; DROP TABLE instruments")
+
+
+def test_cache_database_is_shared_by_the_caches(tmp_path):
+    database = CacheDatabase(tmp_path / "stake.sqlite3")
+    instruments = PersistentCache(database, table="instruments")
+    details = PersistentCache(database, table="details")
+    instruments.set("COL", "COL.XAU")
+    details.set("ref", {"status": "settled"})
+    assert instruments._connection is details._connection
+
+    # the caches do not close a database they share.
+    instruments.close()
+    assert details.get("ref") == {"status": "settled"}
+
+    # a closed database is opened again when used.
+    database.close()
+    assert instruments.get("COL") == "COL.XAU"
+    assert len(details) == 1
+    database.close()
@@ -1,7 +1,18 @@
+import sqlite3
+import time
+
 import pytest
 
-from stake import CredentialsLoginRequest, SessionTokenLoginRequest, StakeClient
-from stake.client import InvalidLoginException
+from stake import (
+    ConnectionPoolSettings,
+    CredentialsLoginRequest,
+    RateLimiter,
+    SessionTokenLoginRequest,
+    StakeClient,
+    constant,
+)
+from stake.client import HttpClient, InvalidLoginException, SessionHttpClient
+from stake.codec import JsonCodec, OrjsonCodec
 
 
 def test_credentials_login_serializing():
@@ -35,3 +46,156 @@ async def test_credentials_login():
     with pytest.raises(InvalidLoginException):
         async with StakeClient(request=request) as client:
             assert client
+
+
+@pytest.mark.asyncio
+async def test_pooled_session_lifecycle():
+    client = StakeClient(
+        pool_settings=ConnectionPoolSettings(limit=10, limit_per_host=5)
+    )
+    assert client.http_client is HttpClient
+
+    await client.open()
+    assert isinstance(client.http_client, SessionHttpClient)
+    session = client.http_client.session
+    assert session.connector.limit == 10
+    assert session.connector.limit_per_host == 5
+
+    # opening twice keeps the same pool
+    await client.open()
+    assert client.http_client.session is session
+
+    await client.close()
+    assert session.closed
+    assert client.http_client is HttpClient
+
+
+def test_request_headers_are_cached():
+    client = StakeClient()
+    headers = client.request_headers
+    assert headers["Stake-Session-Token"] == ""
+    assert client.request_headers is headers
+    with pytest.raises(TypeError):
+        headers["Accept"] = "text/html"  # type: ignore[index]
+
+    # a new session token rebuilds them
+    client.headers.stake_session_token = "token"
+    assert client.request_headers["Stake-Session-Token"] == "token"
+    assert client.request_headers is not headers
+
+
+@pytest.mark.asyncio
+async def test_requests_reuse_the_headers_until_the_token_changes():
+    sent = []
+
+    class RecordingHttpClient:
+        @staticmethod
+        async def request(method, url, data=None, headers=None):
+            sent.append(headers)
+            return b"{}"
+
+    client = StakeClient(rate_limiter=RateLimiter(rate=1e9, burst=1e9))
+    client.http_client = RecordingHttpClient
+    client.headers.stake_session_token = "token-1"
+    for _ in range(3):
+        await client.get(client.exchange.users)
+    client.headers.stake_session_token = "token-2"
+    await client.get(client.exchange.users)
+
+    assert sent[0] is sent[1] is sent[2]
+    assert sent[3] is not sent[0]
+    assert [headers["Stake-Session-Token"] for headers in sent] == [
+        "token-1",
+        "token-1",
+        "token-1",
+        "token-2",
+    ]
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_request_overhead_benchmark(record_property):
+    """Compares the per-request overhead of the client, serializing the headers
+    on every call (before) and using the cached ones (after)."""
+
+    class NoopHttpClient:
+        @staticmethod
+        async def request(method, url, data=None, headers=None):
+            return b"{}"
+
+    class UncachedHeadersClient(StakeClient):
+        @property
+        def request_headers(self):
+            return self.headers.model_dump(by_alias=True)
+
+    requests = 2000
+    for name, client_class in (
+        ("before", UncachedHeadersClient),
+        ("after", StakeClient),
+    ):
+        # no throttling, we only want to measure the client.
+        client = client_class(rate_limiter=RateLimiter(rate=1e9, burst=1e9))
+        client.http_client = NoopHttpClient
+        url = client.exchange.users
+        started = time.perf_counter()
+        for _ in range(requests):
+            await client.get(url)
+        record_property(name, (time.perf_counter() - started) / requests)
+
+
+@pytest.mark.parametrize("codec", (JsonCodec(), OrjsonCodec()))
+@pytest.mark.asyncio
+async def test_json_codec(codec: JsonCodec):
+    pytest.importorskip(codec.name)
+
+    class EchoHttpClient(HttpClient):
+        @staticmethod
+        async def request(method, url, data=None, headers=None):
+            return data or b""
+
+    client = StakeClient(codec=codec)
+    client.http_client = EchoHttpClient
+    url = client.exchange.users
+
+    payload = {"symbol": "AAPL", "quantity": 1.5, "tags": [None, True]}
+    assert await client.post(url, payload) == payload
+    assert codec.loads(await client.post_raw(url, payload)) == payload
+    # empty bodies are decoded as None.
+    assert await client.get(url) is None
+    assert await client.get_raw(url) == b""
+
+
+@pytest.mark.asyncio
+async def test_http_client_json_methods_are_deprecated(monkeypatch):
+    sent = []
+
+    async def request(method, url, data=None, headers=None):
+        sent.append(method)
+        return data or b""
+
+    monkeypatch.setattr(HttpClient, "request", staticmethod(request))
+    url = constant.NYSE.users
+    with pytest.deprecated_call():
+        assert await HttpClient.post(url, {"symbol": "AAPL"}) == {"symbol": "AAPL"}
+    with pytest.deprecated_call():
+        assert await HttpClient.get(url) is None
+    with pytest.deprecated_call():
+        assert await HttpClient.delete(url, {"id": 1}) == {"id": 1}
+    assert sent == ["post", "get", "delete"]
+
+
+@pytest.mark.asyncio
+async def test_client_shares_and_closes_the_cache_database():
+    client = StakeClient(exchange=constant.ASX)
+    client.trades.instrument_index.set("COL", "COL.XAU")
+
+    # the caches outlive the sub-clients.
+    client.set_exchange(constant.NYSE)
+    assert client.fundings.details_cache.database is client.cache_database
+    client.set_exchange(constant.ASX)
+    assert client.trades.instrument_index.get("COL") == "COL.XAU"
+
+    connection = client.cache_database.connection("instrument_ids")
+    await client.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        connection.execute("SELECT 1")
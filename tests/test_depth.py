@@ -0,0 +1,134 @@
+import random
+from typing import Dict, List
+
+import pytest
+
+from stake import constant
+from stake.asx.depth import BookSide, DepthChange, DepthTracker, OrderBook
+
+
+def _level(price: float, volume: int, orders: int = 1) -> dict:
+    return {
+        "id": f"level-{price}",
+        "price": price,
+        "volume": volume,
+        "numberOfOrders": orders,
+        "value": price * volume,
+        "orders": [],
+    }
+
+
+def test_order_book_applies_snapshots_as_diffs():
+    book = OrderBook("ORG")
+    assert book.best_bid is book.best_ask is book.spread is None
+
+    changes = book.apply(
+        {
+            "buyOrders": [_level(12.06, 100), _level(12.05, 200, 2)],
+            "sellOrders": [_level(12.08, 50), _level(12.10, 300, 3)],
+        }
+    )
+    assert len(changes) == 4
+    assert book.best_bid == 12.06
+    assert book.best_ask == 12.08
+    assert book.spread == pytest.approx(0.02)
+    assert book.levels(BookSide.BUY) == [(12.06, 100, 1), (12.05, 200, 2)]
+
+    # the same snapshot changes nothing.
+    assert not book.apply(
+        {
+            "buyOrders": [_level(12.06, 100), _level(12.05, 200, 2)],
+            "sellOrders": [_level(12.08, 50), _level(12.10, 300, 3)],
+        }
+    )
+
+    changes = book.apply(
+        {
+            "buyOrders": [_level(12.07, 10), _level(12.06, 150, 2)],
+            "sellOrders": [_level(12.10, 300, 3)],
+        }
+    )
+    assert set(changes) == {
+        DepthChange(BookSide.BUY, 12.07, 10, 1),
+        DepthChange(BookSide.BUY, 12.06, 150, 2),
+        DepthChange(BookSide.BUY, 12.05, 0, 0),
+        DepthChange(BookSide.SELL, 12.08, 0, 0),
+    }
+    assert book.best_bid == 12.07
+    assert book.best_ask == 12.10
+    assert book.levels(BookSide.BUY) == [(12.07, 10, 1), (12.06, 150, 2)]
+
+
+def test_order_book_ignores_incomplete_levels():
+    book = OrderBook("ORG")
+    book.apply({"buyOrders": [_level(12.06, 100)], "sellOrders": []})
+
+    changes = book.apply(
+        {
+            "buyOrders": [
+                {**_level(12.06, 0), "volume": None},
+                {**_level(12.05, 200), "price": None},
+                _level(12.04, 50),
+            ],
+            "sellOrders": [{**_level(12.08, 10), "volume": None}],
+        }
+    )
+    assert changes == [DepthChange(BookSide.BUY, 12.04, 50, 1)]
+    assert book.levels(BookSide.BUY) == [(12.06, 100, 1), (12.04, 50, 1)]
+    assert book.best_ask is None
+
+
+def test_order_book_cumulative_depth():
+    rng = random.Random(1)
+    book = OrderBook("ORG")
+    for _ in range(20):
+        snapshot: Dict[str, List[dict]] = {
+            key: [
+                _level(round(price, 2), rng.randint(1, 1000))
+                for price in rng.sample([10 + i / 100 for i in range(100)], 30)
+            ]
+            for key in ("buyOrders", "sellOrders")
+        }
+        book.apply(snapshot)
+        for price in (9.0, 10.25, 10.5, 10.991, 12.0):
+            assert book.depth(BookSide.BUY, price) == sum(
+                level["volume"]
+                for level in snapshot["buyOrders"]
+                if level["price"] >= price
+            )
+            assert book.depth(BookSide.SELL, price) == sum(
+                level["volume"]
+                for level in snapshot["sellOrders"]
+                if level["price"] <= price
+            )
+
+
+@pytest.mark.asyncio
+async def test_depth_tracker_follows_symbols():
+    class Client:
+        exchange = constant.ASX
+
+        def __init__(self):
+            self.bids = {"ORG": 12.06, "CBA": 100.0}
+
+        async def get(self, url):
+            symbol = next(s for s in self.bids if s in url)
+            return {
+                "ticker": symbol,
+                "buyOrders": [_level(self.bids[symbol], 100)],
+                "sellOrders": [_level(self.bids[symbol] + 1, 100)],
+            }
+
+    client = Client()
+    tracker = DepthTracker(client)
+    stream = tracker.follow(["ORG", "CBA"], interval=0)
+
+    assert [(await stream.__anext__())[0] for _ in range(2)] == ["ORG", "CBA"]
+    assert tracker.books["CBA"].best_ask == 101.0
+
+    client.bids["CBA"] = 99.0
+    symbol, changes = await stream.__anext__()
+    assert symbol == "CBA"
+    assert DepthChange(BookSide.BUY, 99.0, 100, 1) in changes
+    assert tracker.books["CBA"].best_bid == 99.0
+    await stream.aclose()
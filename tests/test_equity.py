@@ -1,7 +1,10 @@
+import math
+
 import pytest
 
 import stake
-from stake import constant
+from stake import constant, equity
+from stake.asx import equity as asx_equity
 
 
 @pytest.mark.parametrize("exchange", (constant.NYSE, constant.ASX))
@@ -17,3 +20,116 @@ async def test_list_equities(tracing_client: stake.StakeClient, exchange):
 
     for e in equities.equity_positions:
         assert not (set(e.__class__.model_fields.keys()).difference(e.model_fields_set))
+
+
+NYSE_POSITION = {
+    "unrealizedDayPLPercent": 1.0,
+    "symbol": "AAPL",
+    "encodedName": "apple-inc-aapl",
+    "unrealizedDayPL": "1.0",
+    "instrumentID": "1cf93550-8eb4-4c32-a229-826cf8c1be59",
+    "openQty": "100",
+    "priorClose": "151",
+    "avgPrice": "171.19",
+    "side": "B",
+    "costBasis": "1E+3",
+    "mktPrice": "153.04",
+    "marketValue": "893.99",
+    "unrealizedPL": 1.0,
+    "availableForTradingQty": "5.84152111",
+    "name": "Apple, Inc.",
+    "category": "Stock",
+    "urlImage": "https://drivewealth.imgix.net/symbols/aapl.png",
+    "bidPrice": None,
+    "askPrice": None,
+    "lastTrade": 153.04,
+    "dailyReturnValue": 2.04,
+    "period": "YEAR RETURN",
+}
+
+ASX_POSITION = {
+    "instrumentId": "1cf93550-8eb4-4c32-a229-826cf8c1be59",
+    "symbol": "FUEL",
+    "name": "BETA GLOBAL ENERGY ETF UNITS",
+    "openQty": "100",
+    "availableForTradingQty": "170",
+    "averagePrice": "5.9400",
+    "marketValue": "953.7000",
+    "mktPrice": "5.6100",
+    "priorClose": "5.5900",
+    "unrealizedDayPL": "1.0",
+    "unrealizedDayPLPercent": 1.0,
+    "unrealizedPL": 1.0,
+    "unrealizedPLPercent": "1.0",
+}
+
+
+@pytest.mark.parametrize(
+    "exchange, module, data",
+    (
+        (
+            constant.NYSE,
+            equity,
+            {
+                "equityPositions": [NYSE_POSITION, {**NYSE_POSITION, "bidPrice": 1}],
+                "equityValue": 4324.07,
+                "pricesOnly": False,
+            },
+        ),
+        (
+            constant.ASX,
+            asx_equity,
+            {"equityPositions": [ASX_POSITION, {**ASX_POSITION, "mktPrice": None}]},
+        ),
+    ),
+)
+@pytest.mark.asyncio
+async def test_columnar_export(exchange, module, data):
+    numpy = pytest.importorskip("numpy")
+    pyarrow = pytest.importorskip("pyarrow")
+
+    class Client:
+        async def get(self, url):
+            return data
+
+    client = Client()
+    client.exchange = exchange
+    equities = await module.EquitiesClient(client).list()
+    array = equities.to_numpy()
+    table = equities.to_arrow()
+
+    names = [column.name for column in module.COLUMNS]
+    assert list(array.dtype.names) == table.column_names == names
+    assert len(array) == table.num_rows == len(equities.equity_positions)
+
+    for column in module.COLUMNS:
+        values = [getattr(p, column.name, None) for p in equities.equity_positions]
+        if not column.numeric:
+            assert list(array[column.name]) == table[column.name].to_pylist()
+            continue
+        assert array[column.name].dtype == numpy.float64
+        assert table.schema.field(column.name).type == pyarrow.float64()
+        for value, from_numpy, from_arrow in zip(
+            values, array[column.name], table[column.name].to_pylist()
+        ):
+            if value is None:
+                assert math.isnan(from_numpy) and from_arrow is None
+            else:
+                assert from_numpy == from_arrow == pytest.approx(float(value))
+
+    # the same columns are built straight from the json.
+    assert (await module.EquitiesClient(client).list_columns("arrow")).equals(table)
+    columns = await module.EquitiesClient(client).list_columns()
+    for name in names:
+        assert list(columns[name].astype(str)) == list(array[name].astype(str))
+    with pytest.raises(ValueError):
+        await module.EquitiesClient(client).list_columns("csv")
+
+    # the exports follow the positions kept in the model.
+    subset = equities.model_copy(
+        update={"equity_positions": equities.equity_positions[1:]}
+    )
+    assert len(subset.to_numpy()) == subset.to_arrow().num_rows == 1
+    assert subset.to_arrow().equals(table.slice(1))
+    equities.equity_positions = equities.equity_positions[:1]
+    assert equities.to_arrow().equals(table.slice(0, 1))
@@ -1,10 +1,15 @@
+import asyncio
+import json
+import uuid
 from typing import Union
 
+import aiohttp
 import pytest
 
 import stake
 from stake import constant
 from stake.asx.funding import FundingRequest as ASXFundingRequest
+from stake.asx.funding import FundingsClient
 from stake.funding import TransactionRecordRequest as NYSEFundingRequest
 
 
@@ -47,3 +52,111 @@ async def test_funds_in_flight(
 ):
     tracing_client.set_exchange(exchange=exchange)
     await tracing_client.fundings.in_flight()
+
+
+@pytest.mark.asyncio
+async def test_list_all_asx_fundings():
+    total_items = 7
+
+    class Client:
+        exchange = constant.ASX
+
+        def __init__(self):
+            self.running = 0
+            self.max_running = 0
+            self.pages = []
+
+        async def get(self, url):
+            page = int(url.split("page=")[1].split("&")[0])
+            self.pages.append(page)
+            self.running += 1
+            self.max_running = max(self.running, self.max_running)
+            await asyncio.sleep(0.01)
+            self.running -= 1
+            first = page * 2
+            return {
+                "items": [
+                    {"id": str(uuid.UUID(int=i)), "amount": i}
+                    for i in range(first, min(first + 2, total_items))
+                ],
+                "hasNext": first + 2 < total_items,
+                "page": page,
+                "totalItems": total_items,
+            }
+
+    client = Client()
+    fundings = await FundingsClient(client).list_all(
+        ASXFundingRequest(limit=2), concurrency=2
+    )
+
+    assert [funding.amount for funding in fundings.fundings] == list(range(7))
+    assert fundings.total_items == total_items
+    assert not fundings.has_next
+    assert sorted(client.pages) == [0, 1, 2, 3]
+    assert client.max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_list_nyse_fundings_failure_policies():
+    class HttpClient:
+        def __init__(self):
+            self.urls = []
+            self.failures = {"BAD": 1}
+            self.delays = {}
+
+        async def request(self, method, url, data=None, headers=None):
+            if method == "post":
+                return json.dumps(
+                    [
+                        {"reference": reference, "referenceType": "Funding"}
+                        for reference in ("SETTLED", "BAD", "PENDING")
+                    ]
+                    + [{"reference": "SELL", "referenceType": "Sell"}]
+                ).encode()
+            self.urls.append(url)
+            reference = url.split("reference=")[1].split("&")[0]
+            if self.failures.get(reference):
+                self.failures[reference] -= 1
+                raise aiohttp.ClientResponseError(None, (), status=502)  # type: ignore
+            await asyncio.sleep(self.delays.pop(reference, 0))
+            status = "RECONCILED" if reference == "SETTLED" else "PENDING"
+            return json.dumps({"reference": reference, "status": status}).encode()
+
+    http_client = HttpClient()
+    client = stake.StakeClient(
+        rate_limiter=stake.RateLimiter(rate=1e9, burst=1e9),
+        retry_policy=stake.RetryPolicy(base_delay=0.001),
+    )
+    client.http_client = http_client  # type: ignore
+    fundings = client.fundings
+
+    # without the retry policy, a failing details request is only sent once.
+    with pytest.raises(aiohttp.ClientResponseError):
+        await fundings.list(NYSEFundingRequest(), on_error=stake.FailurePolicy.RAISE)
+    assert len([url for url in http_client.urls if "BAD" in url]) == 1
+
+    http_client.failures["BAD"] = 1
+    result = await fundings.list(
+        NYSEFundingRequest(), on_error=stake.FailurePolicy.SKIP, concurrency=1
+    )
+    assert [funding.reference for funding in result] == ["SETTLED", "PENDING"]
+
+    # the client's retry policy retries the failed attempts, each of them
+    # timing out on its own.
+    http_client.failures["BAD"] = 1
+    http_client.delays["PENDING"] = 1.0
+    http_client.urls = []
+    result = await fundings.list(
+        NYSEFundingRequest(), on_error=stake.FailurePolicy.RETRY, timeout=0.05
+    )
+    assert [funding.reference for funding in result] == ["SETTLED", "BAD", "PENDING"]
+    assert len([url for url in http_client.urls if "BAD" in url]) == 2
+    assert len([url for url in http_client.urls if "PENDING" in url]) == 2
+    # the settled funding details are cached.
+    assert not [url for url in http_client.urls if "SETTLED" in url]
+
+    http_client.failures["BAD"] = 3
+    with pytest.raises(aiohttp.ClientResponseError):
+        await fundings.list(
+            NYSEFundingRequest(), on_error=stake.FailurePolicy.RETRY, retries=1
+        )
@@ -1,7 +1,12 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+from unittest import mock
+
 import pytest
 
 import stake
-from stake import constant
+from stake import asx, constant, market
 
 
 @pytest.mark.parametrize("exchange", (constant.NYSE, constant.ASX))
@@ -11,3 +16,113 @@ async def test_check_market_status(tracing_client: stake.StakeClient, exchange):
     tracing_client.set_exchange(exchange)
     market_status = await tracing_client.market.get()
     assert market_status.status.current == "CLOSED"
+
+
+class Client:
+    exchange = constant.NYSE
+
+    def __init__(self, data):
+        self.data = data
+        self.calls = 0
+
+    async def get(self, url: str) -> dict:
+        assert url == self.exchange.market_status
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.data
+
+
+class Timer:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _nyse_status(current: str, change_at: Optional[str] = None) -> dict:
+    return {"response": {"status": {"current": current, "change_at": change_at}}}
+
+
+@pytest.mark.asyncio
+async def test_is_open_is_cached_until_the_status_changes():
+    timer = Timer()
+    change_at = datetime.fromtimestamp(timer.now + 30, tz=timezone.utc).isoformat()
+    client = Client(_nyse_status("open", change_at))
+    market_client = market.MarketClient(client)
+    market_client.cache.timer = timer
+
+    assert all(await asyncio.gather(*(market_client.is_open() for _ in range(5))))
+    assert client.calls == 1
+    assert market_client.cache.expires_at == timer.now + 30
+
+    timer.now += 29
+    assert await market_client.is_open()
+    assert client.calls == 1
+
+    client.data = _nyse_status("closed")
+    timer.now += 1
+    assert not await market_client.is_open()
+    assert client.calls == 2
+    # without a transition time, the status expires after max_staleness.
+    assert market_client.cache.expires_at == timer.now + 60
+
+    # get always fetches the status.
+    await market_client.get()
+    assert client.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_asx_status_expires_after_max_staleness():
+    timer = Timer()
+    client = Client(
+        [{"marketStatus": "open", "lastTradedTimestamp": 1752041427}],
+    )
+    client.exchange = constant.ASX  # type: ignore
+    market_client = asx.market.MarketClient(client)
+    market_client.cache.timer = timer
+    market_client.cache.max_staleness = 10
+
+    assert await market_client.is_open()
+    timer.now += 9
+    assert await market_client.is_open()
+    assert client.calls == 1
+    timer.now += 1
+    assert await market_client.is_open()
+    assert client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_refresher_fetches_the_status_when_it_expires():
+    client = Client(_nyse_status("open"))
+    market_client = market.MarketClient(client)
+    cache = market_client.cache
+    cache.max_staleness = 0.05
+    with mock.patch.object(market, "MIN_REFRESH_INTERVAL", 0.01):
+        cache.start_refresher()
+        await asyncio.sleep(0.12)
+        assert client.calls >= 2
+        assert await market_client.is_open()
+
+        cache.stop_refresher()
+        await asyncio.sleep(0)
+        calls = client.calls
+        await asyncio.sleep(0.1)
+    assert client.calls == calls
+
+
+@pytest.mark.parametrize(
+    "change_at, expected",
+    (
+        (None, None),
+        ("2023-11-14T22:13:20Z", 1_700_000_000.0),
+        ("2023-11-14T17:13:20-05:00", 1_700_000_000.0),
+        ("1700000000000", 1_700_000_000.0),
+        ("1700000000", 1_700_000_000.0),
+        ("2023-11-14T22:13:20", None),
+        ("soon", None),
+    ),
+)
+def test_changes_at(change_at, expected):
+    status = market.MarketStatus(**_nyse_status("open", change_at)["response"])
+    assert market._changes_at(status) == expected
@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import aiohttp
+import pytest
+
+from stake import SessionTokenLoginRequest, StakeClientPool
+from stake.client import HttpClient, InvalidLoginException, SessionHttpClient
+
+
+def _user(token: str) -> dict:
+    return {
+        "userId": f"user-{token}",
+        "firstName": "Kevin",
+        "lastName": "Horn",
+        "emailAddress": f"{token}@example.com",
+        "macStatus": "BASIC_USER",
+        "accountType": "INDIVIDUAL",
+        "regionIdentifier": "AUS",
+    }
+
+
+class TokenHttpClient:
+    """Answers as the user owning the session token of each request."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def request(self, method, url, data=None, headers=None):
+        token = headers["Stake-Session-Token"]
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        if token.startswith("invalid"):
+            raise aiohttp.ClientResponseError(None, (), status=401)  # type: ignore
+        return json.dumps(_user(token)).encode()
+
+
+@pytest.mark.asyncio
+async def test_pool_shares_the_session_and_the_rate_limiter():
+    pool = StakeClientPool(
+        {
+            account: SessionTokenLoginRequest(token=f"token-{account}")
+            for account in ("alice", "bob", "carol")
+        }
+    )
+    assert len(pool) == 3
+    assert list(pool) == ["alice", "bob", "carol"]
+
+    await pool.open()
+    http_client = pool["alice"].http_client
+    assert isinstance(http_client, SessionHttpClient)
+    session = http_client.session
+    for client in pool.clients.values():
+        assert client.http_client is http_client
+        assert client.rate_limiter is pool.rate_limiter
+
+    # each account keeps its own session token.
+    assert pool["alice"].headers is not pool["bob"].headers
+
+    await pool.close()
+    assert session.closed
+    assert all(client.http_client is HttpClient for client in pool.clients.values())
+
+
+@pytest.mark.asyncio
+async def test_login_all_and_run_with_bounded_concurrency():
+    accounts = {f"account-{i}": f"token-{i}" for i in range(8)}
+    accounts["account-8"] = "invalid-token"
+    pool = StakeClientPool(
+        {
+            account: SessionTokenLoginRequest(token=token)
+            for account, token in accounts.items()
+        },
+        concurrency=3,
+    )
+    http_client = TokenHttpClient()
+    for client in pool.clients.values():
+        client.http_client = http_client  # type: ignore
+
+    logins = await pool.login_all()
+    assert pool.logins is logins
+    assert list(logins) == list(accounts)
+    assert http_client.max_in_flight == 3
+    assert isinstance(logins["account-8"].error, InvalidLoginException)
+    assert not logins["account-8"].ok
+    for account, token in list(accounts.items())[:-1]:
+        assert logins[account].ok
+        assert logins[account].result.id == f"user-{token}"
+        assert pool[account].user.id == f"user-{token}"
+
+    async def _user_id(client):
+        return (await client.get(client.exchange.users))["userId"]
+
+    results = await pool.run(_user_id, accounts=["account-1", "account-2", "missing"])
+    assert results["account-1"].result == "user-token-1"
+    assert results["account-2"].result == "user-token-2"
+    assert isinstance(results["missing"].error, KeyError)
+    assert all(result.elapsed >= 0 for result in results.values())
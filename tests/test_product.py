@@ -1,4 +1,5 @@
 import asyncio
+import time
 from typing import List
 
 import aiohttp
@@ -49,8 +50,10 @@ async def test_product_serializer():
 async def test_get_us_product_adds_quote_bid_and_ask():
     class Client:
         exchange = constant.NYSE
+        gets = 0
 
         async def get(self, url):
+            self.gets += 1
             return {
                 "products": [
                     {
@@ -61,7 +64,7 @@ async def test_get_us_product_adds_quote_bid_and_ask():
                         "name": "Sea Limited",
                         "dailyReturn": 1.75,
                         "dailyReturnPercentage": 2.01,
-                        "lastTraded": 89.02,
+                        "lastTraded": 88.0,
                         "monthlyReturn": 0,
                         "popularity": 1,
                         "watched": 1,
@@ -98,6 +101,26 @@ async def test_get_us_product_adds_quote_bid_and_ask():
     assert product.last_trade == 89.02
     assert product.market_status == "POSTMARKET"
 
+    # the product data is cached, the quote is always refreshed.
+    products = ProductsClient(client)
+    await products.get("SE")
+    product = await products.get("SE")
+    assert product
+    assert product.bid == 88.5
+    assert client.gets == 2
+    assert products.cache.stats.hits == 1
+    assert products.cache.stats.misses == 1
+
+    # the product data expires after a minute, and the last traded price
+    # follows the quote.
+    products.cache.timer = lambda: time.monotonic() + 61
+    product = await products.get("SE")
+    assert product
+    assert client.gets == 3
+    assert products.cache.stats.hits == 1
+    assert products.cache.stats.misses == 2
+    assert product.last_traded == 89.02
+
 
 @pytest.mark.parametrize(
     "exchange, symbols",
@@ -179,3 +202,127 @@ async def test_asx_product_course_of_sales(tracing_client: StakeClient):
     assert isinstance(sale.volume, int)
     assert isinstance(sale.value, float)
     assert isinstance(sale.trade_time_millis, int)
+
+
+@pytest.mark.asyncio
+async def test_quotes_are_batched():
+    class Client:
+        exchange = constant.NYSE
+
+        def __init__(self):
+            self.payloads = []
+
+        async def post(self, url, payload):
+            assert url == constant.NYSE.quotes
+            self.payloads.append(payload)
+            return [
+                {"symbol": symbol, "bid": 1.0, "ask": 2.0}
+                for symbol in payload["symbols"]
+                if symbol != "UNKNOWN"
+            ]
+
+    client = Client()
+    products = ProductsClient(client)
+    symbols = ["TSLA", "MSFT", "GOOG", "TSLA", "UNKNOWN"]
+    quotes = await asyncio.gather(*[products.quote(symbol) for symbol in symbols])
+
+    assert client.payloads == [{"symbols": ["TSLA", "MSFT", "GOOG", "UNKNOWN"]}]
+    assert [quote.symbol for quote in quotes[:4]] == symbols[:4]
+    assert quotes[4] is None
+
+    # batches are flushed as soon as they are full
+    products.quote_batcher.max_batch_size = 2
+    products.quote_batcher.window = 60
+    await asyncio.gather(*[products.quote(symbol) for symbol in symbols[:4]])
+    assert client.payloads[1:] == [
+        {"symbols": ["TSLA", "MSFT"]},
+        {"symbols": ["GOOG", "TSLA"]},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_quote_batches_always_resolve():
+    class Client:
+        exchange = constant.NYSE
+        hang = False
+        posts = 0
+
+        async def post(self, url, payload):
+            self.posts += 1
+            if self.hang:
+                await asyncio.Event().wait()
+            # the api formats some symbols its own way.
+            return [
+                {"symbol": symbol.replace(".", "-")} for symbol in payload["symbols"]
+            ]
+
+    client = Client()
+    products = ProductsClient(client)
+    quote = await products.quote("BRK.B")
+    assert quote and quote.symbol == "BRK-B"
+
+    # a cancelled batch does not leave its callers waiting.
+    client.hang = True
+    waiting = asyncio.ensure_future(products.quote("TSLA"))
+    while client.posts < 2:
+        await asyncio.sleep(0.01)
+    for task in products.quote_batcher._tasks:
+        task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(waiting, 1)
+
+
+@pytest.mark.asyncio
+async def test_stream_quotes_yields_changes():
+    class Client:
+        exchange = constant.NYSE
+
+        def __init__(self):
+            self.batches: List[List[str]] = []
+            self.prices = {f"S{i}": 10.0 for i in range(5)}
+
+        async def post(self, url, payload):
+            assert url == constant.NYSE.quotes
+            self.batches.append(payload["symbols"])
+            return [
+                {
+                    "symbol": symbol,
+                    "bid": self.prices[symbol],
+                    "ask": self.prices[symbol] + 1,
+                    # not a streamed field, it does not trigger an update.
+                    "high": len(self.batches),
+                }
+                for symbol in payload["symbols"]
+            ]
+
+    client = Client()
+    stream = ProductsClient(client).stream_quotes(
+        [*client.prices, "S0"], interval=0, batch_size=2
+    )
+
+    # the first poll yields every quote, in batches of at most 2 symbols.
+    first = [await stream.__anext__() for _ in range(5)]
+    assert [quote.symbol for quote in first] == list(client.prices)
+    assert client.batches == [["S0", "S1"], ["S2", "S3"], ["S4"]]
+
+    # then only the changed quotes are yielded.
+    client.prices["S3"] = 11.0
+    quote = await stream.__anext__()
+    assert (quote.symbol, quote.bid) == ("S3", 11.0)
+    assert len(client.batches) == 6
+
+    client.prices["S1"] = client.prices["S4"] = 9.0
+    assert [(await stream.__anext__()).symbol for _ in range(2)] == ["S1", "S4"]
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stream_quotes_without_symbols():
+    class Client:
+        exchange = constant.NYSE
+
+        async def post(self, url, payload):
+            raise AssertionError("no symbols to poll.")
+
+    stream = ProductsClient(Client()).stream_quotes([], interval=0)
+    assert [quote async for quote in stream] == []
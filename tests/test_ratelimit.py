@@ -0,0 +1,71 @@
+import time
+
+import aiohttp
+import pytest
+
+from stake import RateLimiter, RetryPolicy, StakeClient, TokenBucket
+from stake.ratelimit import endpoint_group, retry_after
+
+
+def test_endpoint_group():
+    assert endpoint_group(
+        "https://api2.prd.hellostake.com/api/asx/orders/1/cancel?x=1"
+    ) == ("api2.prd.hellostake.com", "api/asx/orders")
+    assert endpoint_group("https://api2.prd.hellostake.com/api/user") == (
+        "api2.prd.hellostake.com",
+        "api/user",
+    )
+
+
+def test_retry_after():
+    assert retry_after({"Retry-After": "2"}) == 2.0
+    assert retry_after({}) is None
+    assert retry_after({"Retry-After": "soon"}) is None
+    assert 0 <= retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) < 1
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_throttles():
+    bucket = TokenBucket(rate=100, capacity=2)
+    started = time.monotonic()
+    for _ in range(6):
+        await bucket.acquire()
+    # 2 tokens are available straight away, the others come at 100/s
+    assert time.monotonic() - started >= 0.035
+
+    bucket.pause(0.05)
+    started = time.monotonic()
+    await bucket.acquire()
+    assert time.monotonic() - started >= 0.045
+
+
+@pytest.mark.asyncio
+async def test_client_adapts_to_throttling():
+    class ThrottledHttpClient:
+        calls = 0
+
+        @classmethod
+        async def request(cls, method, url, data=None, headers=None):
+            cls.calls += 1
+            if cls.calls == 1:
+                raise aiohttp.ClientResponseError(
+                    None, (), status=429, headers={"Retry-After": "0.05"}
+                )
+            return b"{}"
+
+    rate_limiter = RateLimiter(rate=10, burst=10, recovery=1)
+    client = StakeClient(
+        rate_limiter=rate_limiter, retry_policy=RetryPolicy(max_attempts=1)
+    )
+    client.http_client = ThrottledHttpClient
+    url = client.exchange.users
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        await client.get(url)
+    bucket = rate_limiter.bucket(url)
+    assert bucket.rate == 5
+
+    started = time.monotonic()
+    await client.get(url)
+    assert time.monotonic() - started >= 0.045
+    assert bucket.rate == 6
@@ -0,0 +1,107 @@
+from unittest import mock
+
+import aiohttp
+import pytest
+
+from stake import RetryPolicy, StakeClient, constant
+
+
+def _response_error(status: int) -> aiohttp.ClientResponseError:
+    return aiohttp.ClientResponseError(None, (), status=status)
+
+
+def _connection_error() -> aiohttp.ClientConnectorError:
+    return aiohttp.ClientConnectorError(
+        mock.Mock(host="api2.prd.hellostake.com", port=443, ssl=None),
+        OSError(111, "Connection refused"),
+    )
+
+
+def test_retry_policy():
+    policy = RetryPolicy()
+
+    # reads are always retried on transient errors.
+    assert policy.should_retry("get", constant.NYSE.users, _response_error(502))
+    assert policy.should_retry("delete", constant.NYSE.users, TimeoutError())
+    assert policy.should_retry("post", constant.NYSE.quotes, _response_error(503))
+    assert policy.should_retry(
+        "post",
+        constant.ASX.instrument_from_symbol.format(symbol="COL"),
+        aiohttp.ServerDisconnectedError(),
+    )
+    assert not policy.should_retry("get", constant.NYSE.users, _response_error(401))
+    assert not policy.should_retry("get", constant.NYSE.users, ValueError())
+
+    # the url templates match a single path segment per placeholder.
+    cancel_order = constant.ASX.cancel_order.format(orderId="1cf93550")
+    assert policy.is_idempotent("post", cancel_order)
+    assert not policy.is_idempotent("post", cancel_order + "/more")
+
+    # orders are only retried if they surely have not been created.
+    for url in (
+        constant.NYSE.quick_buy,
+        constant.NYSE.sell_orders,
+        constant.ASX.orders,
+        constant.ASX.orders + "/tradeActivity",
+        constant.ASX.orders + "/1cf93550/amend",
+    ):
+        assert not policy.should_retry("post", url, _response_error(502))
+        assert not policy.should_retry("post", url, aiohttp.ServerDisconnectedError())
+        assert policy.should_retry("post", url, _connection_error())
+        assert policy.should_retry("post", url, _response_error(429))
+
+    assert policy.backoff(0, _response_error(502)) <= policy.base_delay
+    assert policy.backoff(policy.max_attempts - 1, _response_error(502)) is None
+
+
+@pytest.mark.asyncio
+async def test_client_retries_transient_errors():
+    class FlakyHttpClient:
+        errors = []
+        calls = 0
+
+        @classmethod
+        async def request(cls, method, url, data=None, headers=None):
+            cls.calls += 1
+            if cls.errors:
+                raise cls.errors.pop(0)
+            return b'{"ok": true}'
+
+    client = StakeClient(retry_policy=RetryPolicy(base_delay=0.001))
+    client.http_client = FlakyHttpClient
+
+    FlakyHttpClient.errors = [_response_error(502), _connection_error()]
+    assert await client.get(constant.NYSE.users) == {"ok": True}
+    assert FlakyHttpClient.calls == 3
+
+    FlakyHttpClient.calls = 0
+    FlakyHttpClient.errors = [_response_error(502)]
+    with pytest.raises(aiohttp.ClientResponseError):
+        await client.post(constant.NYSE.quick_buy, payload={})
+    assert FlakyHttpClient.calls == 1
+
+    # the attempts are bounded.
+    FlakyHttpClient.calls = 0
+    FlakyHttpClient.errors = [_response_error(503)] * 10
+    with pytest.raises(aiohttp.ClientResponseError):
+        await client.get(constant.NYSE.users)
+    assert FlakyHttpClient.calls == client.retry_policy.max_attempts
+
+
+@pytest.mark.asyncio
+async def test_attempt_timeout_excludes_the_rate_limiter():
+    class HttpClient:
+        calls = 0
+
+        @classmethod
+        async def request(cls, method, url, data=None, headers=None):
+            cls.calls += 1
+            return b'{"ok": true}'
+
+    client = StakeClient(retry_policy=RetryPolicy(max_attempts=1))
+    client.http_client = HttpClient
+    # e.g. paused by the Retry-After of a previous response.
+    client.rate_limiter.bucket(constant.NYSE.users).pause(0.2)
+
+    assert await client.get(constant.NYSE.users, timeout=0.05) == {"ok": True}
+    assert HttpClient.calls == 1
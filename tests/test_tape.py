@@ -0,0 +1,79 @@
+from typing import Dict, List, Optional
+
+import pytest
+
+from stake import constant
+from stake.asx.tape import CourseOfSalesFollower
+
+
+def _sale(id_: str, millis: int, cancelled: Optional[int] = None) -> dict:
+    return {
+        "id": id_,
+        "instrumentCodeId": "1cf93550-8eb4-4c32-a229-826cf8c1be59",
+        "exchangeMarket": "ASX",
+        "price": 12.07,
+        "volume": 100,
+        "value": 1207.0,
+        "tradeTimeMillis": millis,
+        "cancelledTimeMillis": cancelled,
+        "buyOrderNumber": "Z5-3001375g",
+        "sellOrderNumber": "Z5-3001375g",
+    }
+
+
+class Client:
+    exchange = constant.ASX
+
+    def __init__(self):
+        self.sales: Dict[str, List[dict]] = {"ORG": [], "CBA": []}
+
+    async def get(self, url):
+        symbol = next(symbol for symbol in self.sales if symbol in url)
+        # the newest prints come first.
+        return {
+            "ticker": symbol,
+            "courseOfSales": sorted(
+                self.sales[symbol], key=lambda s: s["tradeTimeMillis"], reverse=True
+            ),
+        }
+
+
+@pytest.mark.asyncio
+async def test_poll_reports_new_prints_once():
+    client = Client()
+    follower = CourseOfSalesFollower(client)
+    client.sales["ORG"] = [_sale("1", 1000), _sale("2", 2000)]
+
+    events = await follower.poll("ORG")
+    assert [(e.sale.id, e.cancelled) for e in events] == [("1", False), ("2", False)]
+    assert not await follower.poll("ORG")
+
+    # a print at the same millisecond as the newest one is still new.
+    client.sales["ORG"] += [_sale("3", 2000), _sale("4", 3000)]
+    events = await follower.poll("ORG")
+    assert [e.sale.id for e in events] == ["3", "4"]
+    assert events[0].sale.trade_time_millis == 2000
+
+    # cancellations are reported once.
+    client.sales["ORG"][0] = _sale("1", 1000, cancelled=3500)
+    client.sales["ORG"].append(_sale("5", 4000, cancelled=4100))
+    events = await follower.poll("ORG")
+    assert [(e.sale.id, e.cancelled) for e in events] == [("5", True), ("1", True)]
+    assert not await follower.poll("ORG")
+
+
+@pytest.mark.asyncio
+async def test_follow_many_symbols():
+    client = Client()
+    follower = CourseOfSalesFollower(client)
+    client.sales["ORG"] = [_sale("1", 1000)]
+    client.sales["CBA"] = [_sale("9", 500)]
+
+    stream = follower.follow(["ORG", "CBA", "ORG"], interval=0)
+    first = [await stream.__anext__() for _ in range(2)]
+    assert [(e.symbol, e.sale.id) for e in first] == [("ORG", "1"), ("CBA", "9")]
+
+    client.sales["CBA"].append(_sale("10", 600))
+    event = await stream.__anext__()
+    assert (event.symbol, event.sale.id, event.cancelled) == ("CBA", "10", False)
+    await stream.aclose()
@@ -0,0 +1,70 @@
+import random
+import sys
+
+import pytest
+
+from stake.asx.product import CourseOfSale
+from stake.asx.ticks import TickStore
+
+
+def _ticks(count: int, start: int = 0):
+    rng = random.Random(count)
+    time = start
+    for _ in range(count):
+        time += rng.randint(0, 3)
+        price = round(rng.uniform(10, 12), 2)
+        volume = rng.randint(1, 1000)
+        yield time, price, volume, price * volume
+
+
+@pytest.mark.parametrize("spill_threshold", (1_000_000, 7))
+def test_tick_store_slices_time_ranges(tmp_path, spill_threshold: int):
+    store = TickStore(tmp_path, spill_threshold=spill_threshold)
+    expected = list(_ticks(100))
+    for tick in expected:
+        store.append_tick("ORG", *tick)
+    assert store.count("ORG") == len(store) == 100
+
+    for start, end in ((None, None), (10, 50), (50, 10), (-1, 1000), (30, None)):
+        ticks = store.ticks("ORG", start=start, end=end)
+        rows = [
+            tick
+            for tick in expected
+            if (start is None or tick[0] >= start) and (end is None or tick[0] < end)
+        ]
+        assert list(zip(*ticks)) == rows
+
+    with pytest.raises(ValueError):
+        store.append_tick("ORG", expected[-1][0] - 1, 1.0, 1, 1.0)
+    assert store.ticks("CBA").time.tolist() == []
+
+    # a new store reads the ticks spilled by the previous one.
+    store.close()
+    assert list(zip(*TickStore(tmp_path).ticks("ORG"))) == expected
+
+
+def test_tick_store_appends_course_of_sales():
+    store = TickStore()
+    sales = [
+        CourseOfSale(id=str(i), price=12.0, volume=10, value=120.0, tradeTimeMillis=i)
+        for i in range(5)
+    ]
+    # the prints without a trade time or a price are skipped.
+    sales.insert(2, CourseOfSale(id="no time", price=12.0, volume=10))
+    sales.append(CourseOfSale(id="no price", volume=10, tradeTimeMillis=5))
+    store.append("ORG", sales)
+    assert store.symbols == ["ORG"]
+    assert store.count("ORG") == 5
+    assert store.ticks("ORG", start=3).time.tolist() == [3, 4]
+    with pytest.raises(ValueError):
+        store.append("../ORG", sales)
+
+
+def test_tick_store_is_compact():
+    store = TickStore()
+    for tick in _ticks(100_000):
+        store.append_tick("ORG", *tick)
+    ticks = store.ticks("ORG")
+    size = sum(sys.getsizeof(column) for column in ticks)
+    # 4 columns of 8 bytes each, plus the arrays' overhead.
+    assert size < 100_000 * 32 * 1.1
@@ -1,8 +1,13 @@
+import asyncio
+
+import aiohttp
 import pytest
 
 import stake
 from stake import constant
+from stake.asx import product as asx_product
 from stake.asx import trade as asx_trade
+from stake.cache import CacheDatabase
 from stake.trade import LimitBuyRequest, MarketBuyRequest, StopBuyRequest
 
 
@@ -90,3 +95,264 @@ async def test_sell(tracing_client: stake.StakeClient, exchange, request_):
     assert orders
     # cancel the order
     await tracing_client.orders.cancel(orders[0])
+
+
+@pytest.mark.asyncio
+async def test_asx_instrument_ids_are_indexed(tmp_path):
+    class Client:
+        exchange = constant.ASX
+
+        def __init__(self):
+            self.urls = []
+            self.cache_database = CacheDatabase(tmp_path / "stake.sqlite3")
+
+        async def post(self, url, payload):
+            self.urls.append(url)
+            if url == constant.ASX.instrument_from_symbol.format(symbol="COL"):
+                return {"instrumentId": "COL.XAU"}
+            assert payload["instrumentCode"] == "COL.XAU"
+            return {
+                "order": {
+                    "id": "1cf93550-8eb4-4c32-a229-826cf8c1be59",
+                    "instrumentCode": payload["instrumentCode"],
+                    "placedTimestamp": "2022-07-27T12:17:54.074Z",
+                    "side": payload["side"],
+                    "type": payload["type"],
+                }
+            }
+
+    client = Client()
+    trades = asx_trade.TradesClient(client)
+    request = asx_trade.LimitBuyRequest(symbol="COL", units=20, price=12.0)
+    await trades.buy(request)
+    await trades.buy(request.model_copy(update={"instrument_code": None}))
+    assert client.urls == [
+        constant.ASX.instrument_from_symbol.format(symbol="COL"),
+        constant.ASX.orders,
+        constant.ASX.orders,
+    ]
+
+    # the index is persisted, another client does not need to look it up.
+    client = Client()
+    await asx_trade.TradesClient(client).sell(
+        asx_trade.LimitSellRequest(symbol="COL", units=20, price=12.0)
+    )
+    assert client.urls == [constant.ASX.orders]
+
+
+@pytest.mark.asyncio
+async def test_trade_confirmations_share_polls():
+    from stake.trade import TradeConfirmations
+
+    class Client:
+        exchange = constant.NYSE
+
+        def __init__(self):
+            self.polls = 0
+
+        async def get(self, url):
+            assert url == constant.NYSE.transactions
+            self.polls += 1
+            transactions = [{"orderId": "A", "updatedReason": "JOS TS CXL"}]
+            if self.polls >= 3:
+                transactions.append(
+                    {"orderId": "B", "updatedReason": "0607 Insufficient funds."}
+                )
+            return {"transactions": transactions}
+
+    class Trade:
+        def __init__(self, dw_order_id):
+            self.dw_order_id = dw_order_id
+
+    client = Client()
+    confirmations = TradeConfirmations(client, timeout=0.2, backoff=0.01)
+    results = await asyncio.gather(
+        confirmations.confirm(Trade("A")),
+        confirmations.confirm(Trade("A")),
+        confirmations.confirm(Trade("B")),
+        confirmations.confirm(Trade("C")),
+        return_exceptions=True,
+    )
+
+    assert results[:2] == [None, None]
+    assert "Insufficient funds" in str(results[2])
+    assert str(results[3]) == "Could not find a matching transaction."
+    # the polls are shared and backed off.
+    assert 3 <= client.polls < 10
+
+
+@pytest.mark.asyncio
+async def test_trade_confirmations_retry_transient_poll_errors():
+    from stake.trade import TradeConfirmations
+
+    class Client:
+        exchange = constant.NYSE
+
+        def __init__(self, failures):
+            self.failures = failures
+            self.polls = 0
+
+        async def get(self, url):
+            self.polls += 1
+            if self.polls <= self.failures:
+                raise aiohttp.ServerDisconnectedError()
+            return {"transactions": [{"orderId": "A", "updatedReason": ""}]}
+
+    class Trade:
+        def __init__(self, dw_order_id):
+            self.dw_order_id = dw_order_id
+
+    client = Client(failures=2)
+    confirmations = TradeConfirmations(client, timeout=1.0, backoff=0.01)
+    await confirmations.confirm(Trade("A"))
+    assert client.polls == 3
+
+    # the poll error is only delivered once the deadline is reached.
+    client = Client(failures=100)
+    confirmations = TradeConfirmations(client, timeout=0.1, backoff=0.01)
+    with pytest.raises(aiohttp.ServerDisconnectedError):
+        await confirmations.confirm(Trade("A"))
+    assert client.polls > 1
+    assert confirmations._poller and confirmations._poller.exception() is None
+
+
+@pytest.mark.asyncio
+async def test_submit_batch():
+    from stake.trade import LimitSellRequest, TradesClient
+
+    class User:
+        id = "7c9bbfae-0000-47b7-0000-0e66d868c2cf"
+
+    class Products:
+        def __init__(self):
+            self.symbols = []
+
+        async def get(self, symbol):
+            self.symbols.append(symbol)
+            if symbol == "UNKNOWN":
+                return None
+
+            class Product:
+                id = f"{symbol}-id"
+
+            return Product()
+
+    class Client:
+        exchange = constant.NYSE
+        user = User()
+
+        def __init__(self):
+            self.products = Products()
+            self.posts = []
+            self.polls = 0
+
+        async def post(self, url, payload):
+            self.posts.append((url, payload["itemId"]))
+            symbol = payload["itemId"].split("-")[0]
+            return [
+                {
+                    "category": "Instrument",
+                    "dwOrderId": symbol,
+                    "encodedName": symbol.lower(),
+                    "id": symbol,
+                    "imageURL": "https://example.com",
+                    "insertedDate": 1658924561819,
+                    "itemId": payload["itemId"],
+                    "name": symbol,
+                    "side": "BUY",
+                    "symbol": symbol,
+                    "updatedDate": 1658924561819,
+                }
+            ]
+
+        async def get(self, url):
+            self.polls += 1
+            return {
+                "transactions": [
+                    {"orderId": "TSLA", "updatedReason": ""},
+                    {"orderId": "MSFT", "updatedReason": ""},
+                ]
+            }
+
+    client = Client()
+    results = await TradesClient(client).submit_batch(
+        [
+            LimitBuyRequest(symbol="TSLA", limit_price=100, quantity=1),
+            LimitBuyRequest(symbol="TSLA", limit_price=101, quantity=1),
+            LimitSellRequest(symbol="MSFT", limit_price=100, quantity=1),
+            LimitBuyRequest(symbol="UNKNOWN", limit_price=100, quantity=1),
+        ]
+    )
+
+    assert [result.trade.symbol for result in results[:3]] == ["TSLA", "TSLA", "MSFT"]
+    assert all(result.error is None for result in results[:3])
+    assert isinstance(results[3].error, ValueError)
+    assert sorted(client.products.symbols) == ["MSFT", "TSLA", "UNKNOWN"]
+    assert sorted(client.posts) == [
+        (constant.NYSE.quick_buy, "TSLA-id"),
+        (constant.NYSE.quick_buy, "TSLA-id"),
+        (constant.NYSE.sell_orders, "MSFT-id"),
+    ]
+    assert client.polls == 1
+    assert all(result.elapsed >= 0 for result in results)
+
+
+@pytest.mark.asyncio
+async def test_submit_asx_batch():
+    class Products:
+        def __init__(self):
+            self.symbols = []
+
+        async def get(self, symbol):
+            self.symbols.append(symbol)
+            if symbol == "UNKNOWN":
+                return None
+            return asx_product.Product(symbol=symbol, bid=10.0, ask=11.0)
+
+    class Client:
+        exchange = constant.ASX
+
+        def __init__(self):
+            self.products = Products()
+            self.lookups = []
+            self.orders = []
+            self.cache_database = CacheDatabase()
+
+        async def post(self, url, payload):
+            if url == constant.ASX.orders:
+                self.orders.append((payload["instrumentCode"], payload["price"]))
+                return {
+                    "order": {
+                        "id": "1cf93550-8eb4-4c32-a229-826cf8c1be59",
+                        "instrumentCode": payload["instrumentCode"],
+                        "placedTimestamp": "2022-07-27T12:17:54.074Z",
+                        "side": payload["side"],
+                        "type": payload["type"],
+                    }
+                }
+            symbol = url.rsplit("/", 1)[1]
+            self.lookups.append(symbol)
+            return {"instrumentId": f"{symbol}.XAU"}
+
+    client = Client()
+    results = await asx_trade.TradesClient(client).submit_batch(
+        [
+            asx_trade.MarketBuyRequest(symbol="COL", units=20),
+            asx_trade.MarketSellRequest(symbol="COL", units=10),
+            asx_trade.LimitBuyRequest(symbol="WDS", units=5, price=30.0),
+            asx_trade.MarketBuyRequest(symbol="UNKNOWN", units=1),
+            asx_trade.MarketBuyRequest(instrument_code="BHP.XAU", units=1),
+        ]
+    )
+
+    assert all(result.order and not result.error for result in results[:3])
+    # the failing requests are reported, without stopping the others.
+    assert "UNKNOWN" in str(results[3].error)
+    assert isinstance(results[4].error, ValueError)
+    assert sorted(client.lookups) == ["COL", "UNKNOWN", "WDS"]
+    assert sorted(client.products.symbols) == ["COL", "UNKNOWN"]
+    assert sorted(client.orders) == [
+        ("COL.XAU", 10.0),
+        ("COL.XAU", 11.0),
+        ("WDS.XAU", 30.0),
+    ]
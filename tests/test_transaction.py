@@ -1,3 +1,7 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
 from typing import Union
 
 import pytest
@@ -27,3 +31,224 @@ async def test_list_transactions(
     transactions = await tracing_client.transactions.list(request_)
 
     assert transactions
+
+
+@pytest.mark.asyncio
+async def test_iter_all_asx_transactions():
+    class Client:
+        exchange = constant.ASX
+
+        def __init__(self):
+            self.pages = []
+
+        async def get_raw(self, url):
+            page = int(url.split("page=")[1])
+            self.pages.append(page)
+            return json.dumps(
+                {
+                    "items": [{"units": page * 10 + i} for i in range(2)],
+                    "hasNext": page < 3,
+                    "page": page,
+                }
+            )
+
+    client = Client()
+    transactions = asx_transaction.TransactionsClient(client)
+    request = asx_transaction.TransactionRecordRequest(limit=2, offset=1)
+
+    units = [t.units async for t in transactions.iter_all(request, prefetch=2)]
+    assert units == [10, 11, 20, 21, 30, 31]
+    assert client.pages == [1, 2, 3]
+
+    # breaking out of the loop stops the prefetching.
+    client.pages = []
+    async for _ in transactions.iter_all(request):
+        break
+    await asyncio.sleep(0)
+    assert client.pages[0] == 1
+    assert len(client.pages) <= 3
+
+    with pytest.raises(ValueError):
+        async for _ in transactions.iter_all(request, prefetch=0):
+            pass
+
+
+def _transaction(fin_tran_id: int, when: datetime) -> dict:
+    return {
+        "accountAmount": 1.0,
+        "accountBalance": 1000.0,
+        "accountType": "LIVE",
+        "comment": "T1-0872999T",
+        "dnb": False,
+        "finTranID": str(fin_tran_id),
+        "finTranTypeID": "DIV",
+        "feeSec": 0.0,
+        "feeTaf": 0.0,
+        "feeBase": 0,
+        "feeXtraShares": 0,
+        "feeExchange": 0,
+        "fillQty": 0.0,
+        "fillPx": 0.0,
+        "sendCommissionToInteliclear": False,
+        "systemAmount": 0,
+        "tranAmount": 1000,
+        "tranSource": "INTE",
+        "tranWhen": when.strftime("%Y-%m-%d %H:%M:%S"),
+        "wlpAmount": 0,
+    }
+
+
+def test_transactions_from_json():
+    records = [_transaction(i, datetime(2023, 1, 1)) for i in range(2)]
+    records[1]["instrument"] = {
+        "id": "6f6ee2a5-3d4c-4e8e-9a4b-2d9d5e6a7b8c",
+        "symbol": "AAPL",
+        "name": "Apple Inc",
+    }
+    transactions = transaction._transactions.validate_json(json.dumps(records))
+    assert [t.symbol for t in transactions] == [None, "AAPL"]
+    assert transactions == [transaction.Transaction(**record) for record in records]
+
+
+class _SyncClient:
+    """Pages through its records like the transactions endpoint."""
+
+    exchange = constant.NYSE
+
+    def __init__(self, start: datetime):
+        self.records = [_transaction(i, start + timedelta(days=i)) for i in range(5)]
+        self.payloads: list = []
+
+    async def post_raw(self, url, payload):
+        assert url == constant.NYSE.account_transactions
+        self.payloads.append(payload)
+
+        def _when(value):
+            return datetime.fromisoformat(value).replace(tzinfo=None)
+
+        records = sorted(
+            (r for r in self.records if _when(r["tranWhen"]) >= _when(payload["from"])),
+            key=lambda r: r["tranWhen"],
+            reverse=payload["direction"] == "prev",
+        )
+        if payload["offset"]:
+            offset = _when(payload["offset"])
+            records = [
+                r
+                for r in records
+                if (_when(r["tranWhen"]) > offset) == (payload["direction"] == "next")
+                and _when(r["tranWhen"]) != offset
+            ]
+        return json.dumps(records[: payload["limit"]])
+
+
+@pytest.mark.asyncio
+async def test_sync_transactions():
+    start = datetime(2021, 7, 4)
+
+    client = _SyncClient(start)
+    transactions = transaction.TransactionsClient(client)
+    store = transaction.TransactionStore(account="user-1")
+
+    request = transaction.TransactionRecordRequest(
+        limit=2, **{"from": start - timedelta(days=1)}
+    )
+    added = await transactions.sync(store, request)
+    assert sorted(t.fin_tran_id for t in added) == ["0", "1", "2", "3", "4"]
+    assert len(client.payloads) == 3
+    assert store.latest()[1] == "4"
+
+    # only the new transactions are requested.
+    client.payloads = []
+    client.records.append(_transaction(5, start + timedelta(days=5)))
+    added = await transactions.sync(store, request)
+    assert [t.fin_tran_id for t in added] == ["5"]
+    assert len(client.payloads) == 1
+    assert client.payloads[0]["direction"] == "next"
+
+    assert [t.fin_tran_id for t in store.transactions()] == list("012345")
+    assert [
+        t.fin_tran_id for t in store.transactions(from_=start + timedelta(days=4))
+    ] == ["4", "5"]
+    assert len(store) == 6
+
+
+@pytest.mark.asyncio
+async def test_sync_resumes_an_interrupted_fill():
+    start = datetime(2021, 7, 4)
+
+    class Client:
+        exchange = constant.NYSE
+        calls = 0
+
+        def __init__(self, sync_client):
+            self.sync_client = sync_client
+
+        async def post_raw(self, url, payload):
+            self.calls += 1
+            if self.calls == 2:
+                raise RuntimeError("Connection reset")
+            return await self.sync_client.post_raw(url, payload)
+
+    sync_client = _SyncClient(start)
+    client = Client(sync_client)
+    transactions = transaction.TransactionsClient(client)
+    store = transaction.TransactionStore(account="user-1")
+    request = transaction.TransactionRecordRequest(
+        limit=2, **{"from": start - timedelta(days=1)}
+    )
+
+    # the fill fails after storing the two newest transactions.
+    with pytest.raises(RuntimeError):
+        await transactions.sync(store, request)
+    assert [t.fin_tran_id for t in store.transactions()] == ["3", "4"]
+    assert not store.filled
+
+    # the next sync goes on with the older ones, then the new ones.
+    sync_client.records.append(_transaction(5, start + timedelta(days=5)))
+    added = await transactions.sync(store, request)
+    assert sorted(t.fin_tran_id for t in added) == ["0", "1", "2", "5"]
+    assert [t.fin_tran_id for t in store.transactions()] == list("012345")
+    assert store.filled
+
+
+def test_transaction_stores_are_kept_per_account(tmp_path, monkeypatch):
+    monkeypatch.setenv("STAKE_CACHE_DIR", str(tmp_path))
+    alice = transaction.TransactionStore(account="alice")
+    bob = transaction.TransactionStore(account="bob")
+    alice.append([transaction.Transaction(**_transaction(1, datetime(2023, 1, 1)))])
+    assert len(alice) == 1
+    assert len(bob) == 0
+    assert bob.latest() is None
+
+    for account in (None, "../alice"):
+        with pytest.raises(ValueError):
+            transaction.TransactionStore(account=account)
+    assert len(transaction.TransactionStore(tmp_path / "all.sqlite3")) == 0
+
+
+@pytest.mark.benchmark
+def test_transactions_validation_benchmark(record_property):
+    """Compares the throughput (records/s) of validating 10k transactions one
+    by one (before) and through the module's TypeAdapter (after)."""
+    records = [_transaction(i, datetime(2023, 1, 1)) for i in range(10_000)]
+    data = json.dumps(records)
+
+    def _best(run) -> float:
+        timings = []
+        for _ in range(3):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    timings = {
+        "before": _best(lambda: [transaction.Transaction(**d) for d in records]),
+        "after": _best(lambda: transaction._transactions.validate_python(records)),
+        "before (json)": _best(
+            lambda: [transaction.Transaction(**d) for d in json.loads(data)]
+        ),
+        "after (json)": _best(lambda: transaction._transactions.validate_json(data)),
+    }
+    for name, timing in timings.items():
+        record_property(name, len(records) / timing)